@@ -0,0 +1,61 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+
+# a cache per process
+LOCAL_CACHES = (
+    "django.core.cache.backends.dummy.DummyCache",
+    "django.core.cache.backends.locmem.LocMemCache",
+)
+# incr() reads and writes the value, racing with other processes
+NON_ATOMIC_CACHES = (
+    "django.core.cache.backends.db.DatabaseCache",
+    "django.core.cache.backends.filebased.FileBasedCache",
+)
+
+
+@register(Tags.caches)
+def check_default_cache(app_configs, **kwargs):
+    if settings.DEBUG:
+        return []
+
+    if settings.CACHES["default"]["BACKEND"] in LOCAL_CACHES:
+        return [
+            Error(
+                "The default cache is local to each process, list cache "
+                "invalidation and replica pins don't reach other workers.",
+                hint="Set CACHE_BACKEND to a redis or memcached cache, or "
+                "DEBUG=true while developing.",
+                id="config.E001",
+            )
+        ]
+
+    return []
+
+
+@register(Tags.caches)
+def check_throttle_cache(app_configs, **kwargs):
+    backend = settings.CACHES["throttle"]["BACKEND"]
+
+    if backend in LOCAL_CACHES:
+        return [
+            Warning(
+                "The throttle cache is local to each process, clients get "
+                "the throttle rates once per worker process.",
+                hint="Set THROTTLE_CACHE_BACKEND to a redis or memcached "
+                "cache.",
+                id="config.W001",
+            )
+        ]
+    if backend in NON_ATOMIC_CACHES:
+        return [
+            Warning(
+                "The throttle cache has no atomic incr(), concurrent "
+                "requests of a client may be counted once.",
+                hint="Set THROTTLE_CACHE_BACKEND to a redis or memcached "
+                "cache.",
+                id="config.W002",
+            )
+        ]
+
+    return []
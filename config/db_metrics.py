@@ -0,0 +1,71 @@
+import threading
+import time
+from collections import Counter
+
+from django.core.signals import request_finished
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+
+# per-process counters of database connection churn
+stats = Counter()
+stats_lock = threading.Lock()
+
+
+def count(name: str) -> None:
+    with stats_lock:
+        stats[name] += 1
+
+
+@receiver(request_finished)
+def count_request(sender, **kwargs):
+    count("requests")
+
+
+@receiver(connection_created)
+def count_connection(sender, connection, **kwargs):
+    """Connections set up by Django, new ones or borrowed from a pool"""
+    count("connections")
+
+    if connection.settings_dict.get("POOL_SIZE") is None:
+        count("connections_opened")
+
+
+class DatabaseStatsView(APIView):
+    """
+    Connection churn of the process answering, and how long a round
+    trip to every configured database takes
+    """
+
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request, *args, **kwargs):
+        with stats_lock:
+            current = dict(stats)
+
+        ping_ms = {}
+        for connection in connections.all():
+            started = time.perf_counter()
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            ping_ms[connection.alias] = round(
+                (time.perf_counter() - started) * 1000, 2
+            )
+
+        requests = current.get("requests", 0)
+        return Response(
+            {
+                "requests": requests,
+                "connections": current.get("connections", 0),
+                "connections_opened": current.get("connections_opened", 0),
+                "connections_opened_per_request": (
+                    round(current.get("connections_opened", 0) / requests, 3)
+                    if requests else None
+                ),
+                "ping_ms": ping_ms,
+            }
+        )
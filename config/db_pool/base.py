@@ -0,0 +1,134 @@
+import threading
+
+import psycopg2
+from django.db.backends.postgresql import base
+from psycopg2.pool import ThreadedConnectionPool
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from config.db_metrics import count
+
+
+class PoolTimeout(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "The server is busy, please try again."
+    default_code = "pool_timeout"
+
+
+class CountingConnectionPool(ThreadedConnectionPool):
+    """
+    ThreadedConnectionPool opening connections on demand and keeping
+    up to maxconn of them. When all are borrowed, getconn() waits up to
+    timeout seconds for one to be returned instead of raising PoolError.
+    """
+
+    def __init__(self, maxconn, timeout, *args, **kwargs):
+        super().__init__(0, maxconn, *args, **kwargs)
+        # putconn() closes connections beyond minconn
+        self.minconn = maxconn
+        self.timeout = timeout
+        self.available = threading.BoundedSemaphore(maxconn)
+
+    def _connect(self, key=None):
+        connection = super()._connect(key)
+        count("connections_opened")
+        return connection
+
+    def getconn(self, key=None):
+        if not self.available.acquire(timeout=self.timeout):
+            count("pool_timeouts")
+            raise PoolTimeout()
+
+        try:
+            return super().getconn(key)
+        except Exception:
+            self.available.release()
+            raise
+
+    def putconn(self, conn=None, key=None, close=False):
+        try:
+            super().putconn(conn, key, close)
+        finally:
+            self.available.release()
+
+
+class PooledPsycopg:
+    """
+    Stands in for the psycopg2 module of the backend: connect() borrows
+    a connection from a pool per set of connection parameters, anything
+    else is psycopg2's
+    """
+
+    def __init__(self):
+        self.pools = {}
+        self.borrowed = {}
+        self.lock = threading.Lock()
+
+    def __getattr__(self, name):
+        return getattr(psycopg2, name)
+
+    def connect(self, pool_size, pool_timeout, **conn_params):
+        key = tuple(
+            sorted((name, str(value)) for name, value in conn_params.items())
+        )
+
+        with self.lock:
+            if key not in self.pools:
+                self.pools[key] = CountingConnectionPool(
+                    pool_size, pool_timeout, **conn_params
+                )
+            pool = self.pools[key]
+
+        connection = pool.getconn()
+        with self.lock:
+            self.borrowed[id(connection)] = pool
+
+        return connection
+
+    def release(self, connection, broken: bool = False) -> None:
+        with self.lock:
+            pool = self.borrowed.pop(id(connection))
+
+        pool.putconn(connection, close=broken or bool(connection.closed))
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    PostgreSQL backend taking connections from a per-process pool of up
+    to POOL_SIZE connections instead of opening one per request. A
+    request finding all of them borrowed waits POOL_TIMEOUT seconds for
+    one and is answered with 503 Service Unavailable after that.
+
+    Closing a connection returns it to the pool, which rolls back an
+    unfinished transaction. With CONN_HEALTH_CHECKS a borrowed connection
+    is pinged first and replaced when the server dropped it.
+    """
+
+    Database = PooledPsycopg()
+
+    def get_connection_params(self):
+        return {
+            **super().get_connection_params(),
+            "pool_size": self.settings_dict["POOL_SIZE"],
+            "pool_timeout": self.settings_dict["POOL_TIMEOUT"],
+        }
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+
+        if self.settings_dict["CONN_HEALTH_CHECKS"]:
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                if not connection.autocommit:
+                    connection.rollback()
+            except psycopg2.Error:
+                self.Database.release(connection, broken=True)
+                connection = super().get_new_connection(conn_params)
+
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.Database.release(self.connection)
@@ -0,0 +1,87 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+
+# database alias reads of the current request are routed to
+read_database = ContextVar("read_database", default=None)
+
+
+def pin_key(user) -> str:
+    return f"db-pin:{user.pk}"
+
+
+def pin_to_primary(user) -> None:
+    """Route reads of the user to the primary while replicas catch up"""
+    cache.set(pin_key(user), True, settings.DATABASE_REPLICA_PIN_SECONDS)
+
+
+def is_pinned(user) -> bool:
+    return user.is_authenticated and cache.get(pin_key(user), False)
+
+
+class ReplicaRouter:
+    """
+    Send reads to the replica chosen for the current request (see
+    ReplicaReadMixin) and everything else to the primary, "default".
+    """
+
+    def db_for_read(self, model, **hints):
+        return read_database.get() or "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
+
+
+class ReplicaReadMixin:
+    """
+    Serve safe-method requests of a view from a random read replica of
+    DATABASE_REPLICAS.
+
+    A successful unsafe request pins its user to the primary for
+    DATABASE_REPLICA_PIN_SECONDS, so users read their own writes (a new
+    reservation, held seats) while replication lags behind.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method in SAFE_METHODS
+            and not is_pinned(request.user)
+        ):
+            self.read_database_token = read_database.set(
+                random.choice(settings.DATABASE_REPLICAS)
+            )
+
+    def dispatch(self, request, *args, **kwargs):
+        self.read_database_token = None
+
+        try:
+            response = super().dispatch(request, *args, **kwargs)
+        finally:
+            if self.read_database_token is not None:
+                read_database.reset(self.read_database_token)
+
+        user = getattr(request, "user", None)
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and user is not None
+            and user.is_authenticated
+        ):
+            pin_to_primary(user)
+
+        return response
@@ -10,7 +10,7 @@ load_dotenv()
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 
-DEBUG = os.getenv("DEBUG", default=False)
+DEBUG = os.getenv("DEBUG", default="false").lower() in ("1", "true")
 
 ALLOWED_HOSTS = ["127.0.0.1", "localhost"]
 
@@ -25,6 +25,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 
     "rest_framework",
     "rest_framework_simplejwt",
@@ -74,8 +75,116 @@ DATABASES = {
         "USER": os.getenv("POSTGRES_USER"),
         "PASSWORD": os.getenv("POSTGRES_PASSWORD"),
         "HOST": os.getenv("POSTGRES_HOST"),
+        "PORT": os.getenv("POSTGRES_DB_PORT", default=""),
+        # keep connections open between requests, checked before reuse
+        "CONN_MAX_AGE": int(os.getenv("DATABASE_CONN_MAX_AGE", default=60)),
+        "CONN_HEALTH_CHECKS": True,
+        # PgBouncer in transaction mode can't keep server-side cursors
+        "DISABLE_SERVER_SIDE_CURSORS": os.getenv(
+            "DATABASE_PGBOUNCER", default=""
+        ).lower() in ("1", "true"),
+        "OPTIONS": {
+            "connect_timeout": int(
+                os.getenv("DATABASE_CONNECT_TIMEOUT", default=5)
+            ),
+        },
+    },
+}
+
+# with a size, threads of a process borrow connections from a shared pool
+# (config.db_pool) and return them after every request; when all are in
+# use a request waits up to DATABASE_POOL_TIMEOUT seconds, then gets a 503
+DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", default=0))
+if DATABASE_POOL_SIZE:
+    DATABASES["default"].update(
+        ENGINE="config.db_pool",
+        CONN_MAX_AGE=0,
+        POOL_SIZE=DATABASE_POOL_SIZE,
+        POOL_TIMEOUT=float(os.getenv("DATABASE_POOL_TIMEOUT", default=5)),
+    )
+
+# comma separated hosts of read replicas of the default database; views
+# with config.db_router.ReplicaReadMixin read from them. Replica tests run
+# against a mirror of the test database, e.g. POSTGRES_REPLICA_HOSTS=db
+DATABASE_REPLICAS = []
+for number, host in enumerate(
+    filter(None, os.getenv("POSTGRES_REPLICA_HOSTS", default="").split(",")),
+    start=1,
+):
+    DATABASES[f"replica_{number}"] = {
+        **DATABASES["default"],
+        "HOST": host.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica_{number}")
+
+DATABASE_ROUTERS = ["config.db_router.ReplicaRouter"]
+# seconds a user reads from the primary after changing something
+DATABASE_REPLICA_PIN_SECONDS = int(
+    os.getenv("DATABASE_REPLICA_PIN_SECONDS", default=10)
+)
+
+# redis server of the caches shared by all worker processes
+REDIS_URL = os.getenv("REDIS_URL", default="redis://localhost:6379")
+
+CACHES = {
+    # list cache versions, warmed lists and replica pins; every worker
+    # process must see the same ones, see config.checks
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND",
+            default=(
+                "django.core.cache.backends.locmem.LocMemCache"
+                if DEBUG
+                else "django.core.cache.backends.redis.RedisCache"
+            ),
+        ),
+        "LOCATION": os.getenv(
+            "CACHE_LOCATION", default="" if DEBUG else f"{REDIS_URL}/0"
+        ),
+    },
+    # a single counter per client, see config.throttling; a locmem one
+    # counts per process, so only while developing
+    "throttle": {
+        "BACKEND": os.getenv(
+            "THROTTLE_CACHE_BACKEND",
+            default=(
+                "django.core.cache.backends.locmem.LocMemCache"
+                if DEBUG
+                else "django.core.cache.backends.redis.RedisCache"
+            ),
+        ),
+        "LOCATION": os.getenv(
+            "THROTTLE_CACHE_LOCATION",
+            default="throttle" if DEBUG else f"{REDIS_URL}/1",
+        ),
     },
 }
+# the counters are updated with incr(), atomic in the memcached and
+# redis backends only, see config.checks
+if CACHES["throttle"]["BACKEND"].endswith(".LocMemCache"):
+    CACHES["throttle"]["OPTIONS"] = {"MAX_ENTRIES": 100_000}
+
+# reference lists (genres, actors, halls) are invalidated on change anyway
+LIST_CACHE_TIMEOUT = int(os.getenv("LIST_CACHE_TIMEOUT", default=24 * 60 * 60))
+
+# rendered play catalogue responses kept in every worker process
+PLAY_CATALOGUE_CACHE_SIZE = int(
+    os.getenv("PLAY_CATALOGUE_CACHE_SIZE", default=256)
+)
+PLAY_CATALOGUE_CACHE_TIMEOUT = int(
+    os.getenv("PLAY_CATALOGUE_CACHE_TIMEOUT", default=5 * 60)
+)
+
+# list endpoints serialize .values() rows instead of model instances
+FAST_LIST_SERIALIZERS = os.getenv(
+    "FAST_LIST_SERIALIZERS", default="true"
+).lower() in ("1", "true")
+
+# list endpoints answer ?with_count=true with a count cached this long
+PAGINATION_COUNT_CACHE_TIMEOUT = int(
+    os.getenv("PAGINATION_COUNT_CACHE_TIMEOUT", default=60)
+)
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -113,12 +222,22 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "config.throttling.GCRAAnonRateThrottle",
+        "config.throttling.GCRAUserRateThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {"anon": "200/day", "user": "500/day"},
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.CachedJWTAuthentication",
+    ),
+    # orjson when installed, the stdlib json module otherwise
+    "DEFAULT_RENDERER_CLASSES": (
+        "config.fast_json.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "config.fast_json.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ),
 }
 
@@ -142,6 +261,29 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": False,
 }
 
+# authenticated users are resolved from a per-process cache of this many
+# users, kept for up to AUTH_USER_CACHE_TIMEOUT seconds
+AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", default=1024))
+AUTH_USER_CACHE_TIMEOUT = int(
+    os.getenv("AUTH_USER_CACHE_TIMEOUT", default=60)
+)
+
+SEAT_HOLD_MINUTES = int(os.getenv("SEAT_HOLD_MINUTES", default=10))
+
+# "bulk" fails a reservation with 400 when a concurrent one took its seats,
+# "claim" skips taken seats without aborting the transaction, then rolls
+# the whole reservation back and answers 409 with the lost seats
+RESERVATION_ENGINE = os.getenv("RESERVATION_ENGINE", default="bulk")
+RESERVATION_RETRIES = int(os.getenv("RESERVATION_RETRIES", default=3))
+RESERVATION_RETRY_DELAY = float(
+    os.getenv("RESERVATION_RETRY_DELAY", default=0.05)
+)
+# queue reservations for manage.py run_reservation_worker, answer 202
+RESERVATION_ASYNC = os.getenv("RESERVATION_ASYNC", default="").lower() in (
+    "1",
+    "true",
+)
+
 mimetypes.add_type("application/javascript", ".js", True)
 
 DEBUG_TOOLBAR_CONFIG = {
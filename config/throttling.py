@@ -0,0 +1,70 @@
+import math
+
+from django.core.cache import caches
+from django.utils.connection import ConnectionProxy
+from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+
+
+class GCRAThrottleMixin:
+    """
+    Generic cell rate algorithm on top of SimpleRateThrottle.
+
+    Instead of a list of request timestamps, every key holds a single
+    number, the theoretical arrival time of the next request in
+    milliseconds, in the "throttle" cache. A check books the next slot
+    with one atomic incr() (and gives it back when refused), so
+    concurrent requests of a client can't both read the old time, and
+    the limit holds across processes with a memcached or redis cache.
+    """
+
+    cache = ConnectionProxy(caches, "throttle")
+    # incr() fails when the key expires right after add()
+    attempts = 3
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        now = self.timer()
+        interval = round(self.duration * 1000 / self.num_requests)
+        arrival = self.book_arrival(now, interval)
+
+        # up to num_requests may arrive at once, then one every interval
+        self.wait_time = arrival / 1000 - now - self.duration
+        if self.wait_time > 0:
+            self.cache.incr(self.key, -interval)
+            return self.throttle_failure()
+
+        # the key lives until the client is idle again
+        self.cache.touch(self.key, math.ceil(arrival / 1000 - now))
+        return self.throttle_success()
+
+    def book_arrival(self, now: float, interval: int) -> int:
+        """Theoretical arrival time after booking this request's slot"""
+        for _ in range(self.attempts):
+            # idle clients start from now
+            self.cache.add(self.key, round(now * 1000), self.duration)
+            try:
+                return self.cache.incr(self.key, interval)
+            except ValueError:
+                continue
+
+        return round(now * 1000) + interval
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        return self.wait_time
+
+
+class GCRAAnonRateThrottle(GCRAThrottleMixin, AnonRateThrottle):
+    pass
+
+
+class GCRAUserRateThrottle(GCRAThrottleMixin, UserRateThrottle):
+    pass
@@ -8,6 +8,8 @@ from drf_spectacular.views import (
     SpectacularRedocView,
 )
 
+from config.db_metrics import DatabaseStatsView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path(
@@ -18,6 +20,9 @@ urlpatterns = [
                 )
     ),
     path("api/user/", include("user.urls", namespace="user")),
+    path(
+        "api/health/db/", DatabaseStatsView.as_view(), name="database-stats"
+    ),
 
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path(
@@ -6,8 +6,12 @@ from .models import (
     Actor,
     Play,
     Performance,
+    PerformanceSummary,
     Reservation,
     Ticket,
+    ArchivedTicket,
+    SeatHold,
+    ReservationRequest,
 )
 
 admin.site.register(TheatreHall)
@@ -15,5 +19,9 @@ admin.site.register(Genre)
 admin.site.register(Actor)
 admin.site.register(Play)
 admin.site.register(Performance)
+admin.site.register(PerformanceSummary)
 admin.site.register(Reservation)
 admin.site.register(Ticket)
+admin.site.register(ArchivedTicket)
+admin.site.register(SeatHold)
+admin.site.register(ReservationRequest)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class PerformanceConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'performance'
+
+    def ready(self):
+        from config import checks  # noqa: F401
+        from performance import signals  # noqa: F401
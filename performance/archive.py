@@ -0,0 +1,61 @@
+from django.db import transaction
+
+from performance.models import ArchivedTicket, Performance, Ticket
+
+
+ARCHIVED_FIELDS = (
+    "id",
+    "performance_id",
+    "reservation_id",
+    "row",
+    "seat",
+    "updated_at",
+)
+
+
+def finished_tickets(before):
+    """Tickets of the performances shown before the given datetime"""
+    return Ticket.objects.filter(performance__show_time__lt=before)
+
+
+def archive_ticket_batch(before, batch_size: int) -> int:
+    """
+    Move up to batch_size tickets of performances shown before the
+    given datetime to ArchivedTicket in one transaction; return how
+    many were moved, 0 once there is nothing left.
+
+    The performances are marked archived first: the seats they sell
+    from then on would not hit the Ticket unique constraint anymore,
+    so create_reservation refuses them.
+    """
+    with transaction.atomic():
+        Performance.objects.filter(
+            show_time__lt=before, archived=False
+        ).update(archived=True)
+        tickets = list(
+            finished_tickets(before)
+            .order_by("id")
+            .select_for_update(of=("self",))
+            .values(*ARCHIVED_FIELDS)[:batch_size]
+        )
+
+        if not tickets:
+            return 0
+
+        ArchivedTicket.objects.bulk_create(
+            ArchivedTicket(**ticket) for ticket in tickets
+        )
+        Ticket.objects.filter(
+            id__in=[ticket["id"] for ticket in tickets]
+        ).delete()
+
+    return len(tickets)
+
+
+def archive_tickets(before, batch_size: int = 1000):
+    """Archive the tickets batch by batch, yielding each batch size"""
+    while True:
+        moved = archive_ticket_batch(before, batch_size)
+        if not moved:
+            return
+        yield moved
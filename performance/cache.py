@@ -0,0 +1,179 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+
+def version_key(model) -> str:
+    return f"{model._meta.label_lower}:version"
+
+
+def get_version(model) -> int:
+    """Current change version of the model's rows"""
+    return cache.get_or_set(version_key(model), 1, timeout=None)
+
+
+def bump_version(model) -> None:
+    """Make every cached response built from the model's rows stale"""
+    try:
+        cache.incr(version_key(model))
+    except ValueError:
+        cache.set(version_key(model), 2, timeout=None)
+
+
+def get_versions(models) -> tuple:
+    """Change versions of several models with one cache round trip"""
+    versions = cache.get_many([version_key(model) for model in models])
+    return tuple(versions.get(version_key(model), 1) for model in models)
+
+
+def list_cache_key(model, path: str) -> str:
+    return f"{model._meta.label_lower}:v{get_version(model)}:list:{path}"
+
+
+class CachedListMixin:
+    """
+    Serve list() from the cache until a row of the viewset's model
+    is saved or deleted (see performance.signals)
+    """
+
+    list_cache_timeout = settings.LIST_CACHE_TIMEOUT
+
+    def list(self, request, *args, **kwargs):
+        key = list_cache_key(self.queryset.model, request.get_full_path())
+        data = cache.get(key)
+
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(key, data, timeout=self.list_cache_timeout)
+
+        return Response(data)
+
+
+class ConditionalListMixin:
+    """
+    Answer list() with 304 Not Modified when the client already has
+    the current content. The ETag is computed from the number of rows
+    and the latest updated_at of the filtered queryset, one aggregate
+    query, without serializing or rendering anything.
+
+    No Last-Modified is sent: deleting a row doesn't move the latest
+    updated_at forward, only the row count catches it, so
+    If-Modified-Since would answer 304 for a list that lost a row.
+    """
+
+    def last_modified_fields(self) -> tuple:
+        """updated_at lookups of every row the listed content is built from"""
+        return ("updated_at",)
+
+    def list(self, request, *args, **kwargs):
+        state = (
+            self.filter_queryset(self.get_queryset())
+            .order_by()
+            .aggregate(
+                *(Max(field) for field in self.last_modified_fields()),
+                count=Count("pk"),
+            )
+        )
+        count = state.pop("count")
+        latest = max(filter(None, state.values()), default=None)
+        etag = quote_etag(
+            hashlib.md5(
+                f"{count}:{latest}:"
+                f"{request.accepted_media_type}:{request.get_full_path()}"
+                .encode()
+            ).hexdigest()
+        )
+
+        response = get_conditional_response(request, etag=etag)
+
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+
+        response["ETag"] = etag
+
+        return response
+
+
+class RenderedListCacheMixin:
+    """
+    Keep the rendered JSON bytes of list() responses per normalized
+    query in an in-process LRU cache, so popular queries skip the ORM
+    and the serializer altogether.
+
+    Entries belong to the change versions of rendered_cache_models
+    (bumped by performance.signals), so any change makes them stale.
+    """
+
+    rendered_cache = None
+    rendered_cache_models = ()
+    # query params holding comma separated ids / case insensitive text
+    id_list_params = ()
+    text_params = ()
+
+    def normalized_params(self, request) -> dict:
+        """
+        Query params with sorted id lists and stripped lower-cased text,
+        get_queryset() must filter by these so equal keys mean equal rows
+        """
+        params = {}
+
+        for name, value in request.query_params.items():
+            if name in self.id_list_params:
+                try:
+                    ids = sorted({int(item) for item in value.split(",")})
+                except ValueError:
+                    raise ValidationError(
+                        {name: "Use comma separated integer ids."}
+                    )
+                value = ",".join(map(str, ids))
+            elif name in self.text_params:
+                value = value.strip().lower()
+            params[name] = value
+
+        return params
+
+    def normalized_query(self, request) -> tuple:
+        # image urls and pagination links are absolute
+        return (
+            request.build_absolute_uri("/"),
+            tuple(sorted(self.normalized_params(request).items())),
+        )
+
+    def list(self, request, *args, **kwargs):
+        if request.accepted_renderer.format != "json":
+            return super().list(request, *args, **kwargs)
+
+        key = (
+            get_versions(self.rendered_cache_models),
+            request.accepted_media_type,
+            self.normalized_query(request),
+        )
+
+        cached = self.rendered_cache.get(key)
+        if cached is not None:
+            content, headers = cached
+            return get_conditional_response(
+                request,
+                etag=headers.get("ETag"),
+                response=HttpResponse(content, headers=headers),
+            )
+
+        response = super().list(request, *args, **kwargs)
+
+        if response.status_code == 200:
+            response.accepted_renderer = request.accepted_renderer
+            response.accepted_media_type = request.accepted_media_type
+            response.renderer_context = self.get_renderer_context()
+            response.render()
+            self.rendered_cache.set(
+                key, (response.content, dict(response.items()))
+            )
+
+        return response
@@ -0,0 +1,19 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class SeatsUnavailable(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Some of the seats were sold to another customer."
+    default_code = "seats_unavailable"
+
+    def __init__(self, seats, detail=None, code=None):
+        super().__init__(detail, code)
+        self.seats = sorted(seats)
+        self.detail = {
+            "detail": self.detail,
+            "seats": [
+                {"performance": performance_id, "row": row, "seat": seat}
+                for performance_id, row, seat in self.seats
+            ],
+        }
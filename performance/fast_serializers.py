@@ -0,0 +1,176 @@
+from abc import ABC, abstractmethod
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import F
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from performance.models import Play
+
+
+# stateless DRF fields reused for values needing the same formatting
+DATETIME_FIELD = serializers.DateTimeField()
+
+
+class ValuesSerializer(ABC):
+    """
+    Read only list serializer working on .values() rows instead of
+    model instances. Output must match serializer_class of the viewset
+    exactly, see performance/tests/test_fast_serializers.py.
+    """
+
+    fields = ()
+    # name -> expression, selected next to fields
+    expressions = {}
+
+    def __init__(self, context: dict = None):
+        self.context = context or {}
+
+    def values(self, queryset):
+        return queryset.prefetch_related(None).values(
+            *self.fields, **self.expressions
+        )
+
+    def prepare(self, rows: list) -> None:
+        """Fetch whatever the rows of a page need, e.g. M2M maps"""
+
+    @abstractmethod
+    def to_representation(self, row: dict) -> dict:
+        """Output of one values() row"""
+
+    def serialize(self, rows) -> list:
+        rows = list(rows)
+        self.prepare(rows)
+        return [self.to_representation(row) for row in rows]
+
+    def image_url(self, name: str):
+        """What serializers.ImageField gives for a stored file name"""
+        if not name:
+            return None
+
+        url = Play._meta.get_field("image").storage.url(name)
+        request = self.context.get("request")
+
+        if request is not None:
+            return request.build_absolute_uri(url)
+
+        return url
+
+
+def full_name(first_name: str, last_name: str) -> str:
+    """Actor.full_name without an Actor instance"""
+    return first_name + " " + last_name
+
+
+class ActorValuesSerializer(ValuesSerializer):
+    """Rows of ActorSerializer"""
+
+    fields = ("id", "first_name", "last_name")
+
+    def to_representation(self, row: dict) -> dict:
+        return {
+            "id": row["id"],
+            "first_name": row["first_name"],
+            "last_name": row["last_name"],
+            "full_name": full_name(row["first_name"], row["last_name"]),
+        }
+
+
+class PlayListValuesSerializer(ValuesSerializer):
+    """Rows of PlayListSerializer, with genre and actor names of a page"""
+
+    fields = ("id", "title", "image")
+
+    def prepare(self, rows: list) -> None:
+        play_ids = [row["id"] for row in rows]
+        self.genres = defaultdict(list)
+        self.actors = defaultdict(list)
+
+        # same order as prefetch_related("genres", "actors") gives
+        for play_id, name in (
+            Play.genres.through.objects.filter(play_id__in=play_ids)
+            .order_by("genre__name")
+            .values_list("play_id", "genre__name")
+        ):
+            self.genres[play_id].append(name)
+
+        for play_id, first_name, last_name in (
+            Play.actors.through.objects.filter(play_id__in=play_ids)
+            .order_by("actor__first_name", "actor_id")
+            .values_list("play_id", "actor__first_name", "actor__last_name")
+        ):
+            self.actors[play_id].append(full_name(first_name, last_name))
+
+    def to_representation(self, row: dict) -> dict:
+        return {
+            "id": row["id"],
+            "title": row["title"],
+            "genres": self.genres[row["id"]],
+            "actors": self.actors[row["id"]],
+            "image": self.image_url(row["image"]),
+        }
+
+
+class PerformanceListValuesSerializer(ValuesSerializer):
+    """Rows of PerformanceListSerializer, joined in the same query"""
+
+    fields = ("id", "show_time", "seats_sold")
+    expressions = {
+        "play_title": F("play__title"),
+        "play_image": F("play__image"),
+        "theatre_hall_name": F("theatre_hall__name"),
+        "theatre_hall_capacity": (
+            F("theatre_hall__rows") * F("theatre_hall__seats_in_row")
+        ),
+    }
+
+    def to_representation(self, row: dict) -> dict:
+        return {
+            "id": row["id"],
+            "show_time": DATETIME_FIELD.to_representation(row["show_time"]),
+            "play_title": row["play_title"],
+            "play_image": self.image_url(row["play_image"]),
+            "theatre_hall_name": row["theatre_hall_name"],
+            "theatre_hall_capacity": row["theatre_hall_capacity"],
+            "tickets_available": (
+                row["theatre_hall_capacity"] - row["seats_sold"]
+            ),
+        }
+
+
+class ValuesListMixin:
+    """
+    list() serializing .values() rows with get_values_serializer_class()
+    instead of model instances with the viewset serializer, which stays
+    in use for everything else, including the schema.
+
+    Switched off with FAST_LIST_SERIALIZERS=false.
+    """
+
+    values_serializer_class = None
+
+    def get_values_serializer_class(self):
+        return self.values_serializer_class
+
+    def list(self, request, *args, **kwargs):
+        values_serializer_class = self.get_values_serializer_class()
+
+        if (
+            not settings.FAST_LIST_SERIALIZERS
+            or values_serializer_class is None
+        ):
+            return super().list(request, *args, **kwargs)
+
+        serializer = values_serializer_class(
+            context=self.get_serializer_context()
+        )
+        queryset = serializer.values(
+            self.filter_queryset(self.get_queryset())
+        )
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+
+        return Response(serializer.serialize(queryset))
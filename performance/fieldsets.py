@@ -0,0 +1,212 @@
+from django.db.models import Prefetch, QuerySet
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.permissions import SAFE_METHODS
+
+
+SPARSE_FIELDS_PARAMETERS = [
+    OpenApiParameter(
+        "fields",
+        type=OpenApiTypes.STR,
+        description="Only return these fields (ex. ?fields=id,title)",
+    ),
+    OpenApiParameter(
+        "expand",
+        type=OpenApiTypes.STR,
+        description="Nest these related objects (ex. ?expand=play)",
+    ),
+]
+
+
+def requested_names(request, param: str):
+    """Comma separated names of a query param, None when not given"""
+    value = request.query_params.get(param, "")
+    names = {name.strip() for name in value.split(",")} - {""}
+
+    return names or None
+
+
+def requested_fieldset(request) -> tuple:
+    """(?fields= names or None, ?expand= names) of a read request"""
+    if request is None or request.method not in SAFE_METHODS:
+        return None, set()
+
+    return (
+        requested_names(request, "fields"),
+        requested_names(request, "expand") or set(),
+    )
+
+
+def select_related_lookups(select_related, prefix: str = "") -> list:
+    """Flatten Query.select_related ({"play": {}, ...}) into lookups"""
+    lookups = []
+
+    for name, nested in select_related.items():
+        lookups.append(prefix + name)
+        lookups.extend(select_related_lookups(nested, f"{prefix}{name}__"))
+
+    return lookups
+
+
+def lookup_name(lookup) -> str:
+    if isinstance(lookup, Prefetch):
+        return lookup.prefetch_to
+
+    return lookup
+
+
+def prune_lookups(lookups, unused: set, needed: set) -> list:
+    """Drop lookups starting with an unused relation, add needed ones"""
+    kept = [
+        lookup for lookup in lookups
+        if lookup_name(lookup).split("__")[0] not in unused
+    ]
+    names = {lookup_name(lookup) for lookup in kept}
+
+    return kept + sorted(needed - names)
+
+
+class Expansion:
+    """Nested serializer shown instead of a field with ?expand=<field>"""
+
+    def __init__(self, serializer_class, select_related=(),
+                 prefetch_related=(), last_modified=(), **kwargs):
+        self.serializer_class = serializer_class
+        self.select_related = tuple(select_related)
+        self.prefetch_related = tuple(prefetch_related)
+        # updated_at lookups of the nested rows, for conditional GET
+        self.last_modified = tuple(last_modified)
+        self.kwargs = kwargs
+
+    def field(self):
+        return self.serializer_class(read_only=True, **self.kwargs)
+
+
+class SparseFieldsSerializerMixin:
+    """
+    ?fields=id,title keeps only the listed fields and ?expand=play
+    replaces the expandable_fields with nested objects, on read
+    requests of the top level serializer.
+
+    select_related_fields / prefetch_related_fields name the relations
+    each field reads, so SparseFieldsMixin can drop unused joins.
+    """
+
+    expandable_fields = {}
+    select_related_fields = {}
+    prefetch_related_fields = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields, expand = requested_fieldset(self.context.get("request"))
+
+        for name in expand & self.expandable_fields.keys():
+            self.fields[name] = self.expandable_fields[name].field()
+
+        if fields is not None:
+            for name in set(self.fields) - fields:
+                self.fields.pop(name)
+
+    @classmethod
+    def relations(cls, expand: set) -> tuple:
+        """field -> select_related and prefetch_related lookups it needs"""
+        select = dict(cls.select_related_fields)
+        prefetch = dict(cls.prefetch_related_fields)
+
+        for name in expand & cls.expandable_fields.keys():
+            expansion = cls.expandable_fields[name]
+            select[name] = (*select.get(name, ()), *expansion.select_related)
+            prefetch[name] = (
+                *prefetch.get(name, ()), *expansion.prefetch_related
+            )
+
+        return select, prefetch
+
+    @classmethod
+    def prune_queryset(cls, queryset: QuerySet, fields, expand: set):
+        """Keep the joins and prefetches the requested fields need"""
+        if fields is None and not expand:
+            return queryset
+
+        select, prefetch = cls.relations(expand)
+        if fields is None:
+            fields = set(select) | set(prefetch)
+
+        def needed(relations: dict) -> set:
+            return {
+                lookup
+                for name in fields & relations.keys()
+                for lookup in relations[name]
+            }
+
+        def unused(relations: dict) -> set:
+            declared = {
+                lookup.split("__")[0]
+                for lookups in relations.values()
+                for lookup in lookups
+            }
+            return declared - {
+                lookup.split("__")[0] for lookup in needed(relations)
+            }
+
+        if isinstance(queryset.query.select_related, dict):
+            lookups = prune_lookups(
+                select_related_lookups(queryset.query.select_related),
+                unused(select),
+                needed(select),
+            )
+            queryset = queryset.select_related(None)
+            if lookups:
+                queryset = queryset.select_related(*lookups)
+
+        lookups = prune_lookups(
+            queryset._prefetch_related_lookups,
+            unused(prefetch),
+            needed(prefetch),
+        )
+        return queryset.prefetch_related(None).prefetch_related(*lookups)
+
+
+class SparseFieldsMixin:
+    """
+    Viewset side of SparseFieldsSerializerMixin: the queryset of list()
+    and get_object() only joins and prefetches what the requested
+    fields and expansions read
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        serializer_class = self.get_serializer_class()
+
+        if not issubclass(serializer_class, SparseFieldsSerializerMixin):
+            return queryset
+
+        return serializer_class.prune_queryset(
+            queryset, *requested_fieldset(self.request)
+        )
+
+    def last_modified_fields(self) -> tuple:
+        """Expanded rows are part of the content for ConditionalListMixin"""
+        fields = super().last_modified_fields()
+        serializer_class = self.get_serializer_class()
+
+        if not issubclass(serializer_class, SparseFieldsSerializerMixin):
+            return fields
+
+        _, expand = requested_fieldset(self.request)
+        expandable = serializer_class.expandable_fields
+
+        return fields + tuple(
+            lookup
+            for name in sorted(expand & expandable.keys())
+            for lookup in expandable[name].last_modified
+        )
+
+    def get_values_serializer_class(self):
+        """Sparse and expanded lists are built by the regular serializers"""
+        fields, expand = requested_fieldset(self.request)
+
+        if fields is not None or expand:
+            return None
+
+        return super().get_values_serializer_class()
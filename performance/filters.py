@@ -0,0 +1,30 @@
+from django.db.models import Exists, OuterRef
+
+
+def filter_related(queryset, field: str, ids: list, match_all: bool = False):
+    """
+    Keep rows of queryset related through the many-to-many field to any
+    (or, with match_all, every one) of ids.
+
+    Every condition is an EXISTS on the through table instead of a join,
+    so rows are not multiplied and no DISTINCT is needed.
+    """
+    relation = queryset.model._meta.get_field(field)
+    through = relation.remote_field.through
+    source = relation.m2m_field_name()
+    target = relation.m2m_reverse_field_name()
+
+    def related(*target_ids):
+        return Exists(
+            through.objects.filter(
+                **{source: OuterRef("pk"), f"{target}__in": target_ids}
+            )
+        )
+
+    if not match_all:
+        return queryset.filter(related(*ids))
+
+    for target_id in set(ids):
+        queryset = queryset.filter(related(target_id))
+
+    return queryset
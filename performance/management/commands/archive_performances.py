@@ -0,0 +1,58 @@
+from datetime import datetime, time
+
+from django.core.management import BaseCommand, CommandError
+from django.utils import timezone
+
+from performance.archive import archive_tickets, finished_tickets
+
+
+class Command(BaseCommand):
+    help = (
+        "Move tickets of performances shown before a date to the archive, "
+        "so the Ticket table only holds upcoming shows"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--before",
+            required=True,
+            help="Archive performances shown before this day (YYYY-mm-dd)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Tickets moved per transaction",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many tickets would be archived",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            day = datetime.strptime(options["before"], "%Y-%m-%d").date()
+        except ValueError:
+            raise CommandError("--before must be a date as YYYY-mm-dd")
+
+        before = timezone.make_aware(datetime.combine(day, time.min))
+        if before > timezone.now():
+            raise CommandError("--before must not be in the future")
+
+        if options["dry_run"]:
+            self.stdout.write(
+                f"{finished_tickets(before).count()} ticket(s) to archive"
+            )
+            return
+
+        archived = 0
+        for moved in archive_tickets(before, options["batch_size"]):
+            archived += moved
+            self.stdout.write(f"{archived} ticket(s) archived")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{archived} ticket(s) of performances before {day} archived"
+            )
+        )
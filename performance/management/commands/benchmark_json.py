@@ -0,0 +1,156 @@
+import io
+import statistics
+import time
+
+from django.core.management import BaseCommand, CommandError
+from django.test import RequestFactory
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from config import fast_json
+from config.fast_json import FastJSONParser, FastJSONRenderer
+from performance.models import Actor, Genre, Performance, Play, TheatreHall
+from performance.serializers import (
+    ActorSerializer,
+    PerformanceListSerializer,
+    PlayListSerializer,
+)
+
+
+BENCHMARK_NAME = "JSON benchmark"
+
+
+class Command(BaseCommand):
+    help = (
+        "Render and parse the actor, play and performance lists with DRF's "
+        "JSON renderer/parser and the fast ones. Run against a local "
+        "database only, it creates and removes data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--objects", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the seeded plays, performances, genres and actors",
+        )
+
+    def handle(self, *args, **options):
+        if fast_json.orjson is None:
+            raise CommandError(
+                "orjson is not installed, the fast renderer falls back "
+                "to the stdlib json module"
+            )
+
+        play_ids, theatre_hall, genres, actors = self.seed(options["objects"])
+        request = RequestFactory(SERVER_NAME="localhost").get("/")
+        context = {"request": request}
+
+        try:
+            lists = {
+                "actors": ActorSerializer(
+                    Actor.objects.filter(id__in=[a.id for a in actors]),
+                    many=True,
+                ),
+                "plays": PlayListSerializer(
+                    Play.objects.filter(id__in=play_ids).prefetch_related(
+                        "genres", "actors"
+                    ),
+                    many=True,
+                    context=context,
+                ),
+                "performances": PerformanceListSerializer(
+                    Performance.objects.filter(
+                        theatre_hall=theatre_hall
+                    ).select_related("play", "theatre_hall"),
+                    many=True,
+                    context=context,
+                ),
+            }
+
+            for name, serializer in lists.items():
+                self.measure(name, serializer.data, options["repeat"])
+        finally:
+            if not options["keep"]:
+                Play.objects.filter(id__in=play_ids).delete()
+                theatre_hall.delete()
+                Genre.objects.filter(id__in=[g.id for g in genres]).delete()
+                Actor.objects.filter(id__in=[a.id for a in actors]).delete()
+
+    def seed(self, count: int) -> tuple:
+        genres = Genre.objects.bulk_create(
+            Genre(name=f"{BENCHMARK_NAME} {number}") for number in range(5)
+        )
+        actors = Actor.objects.bulk_create(
+            Actor(first_name=BENCHMARK_NAME, last_name=f"Ünïcode {number}")
+            for number in range(count)
+        )
+        plays = Play.objects.bulk_create(
+            Play(
+                title=BENCHMARK_NAME,
+                description="",
+                image=f"uploads/plays/benchmark-{number}.jpg",
+            )
+            for number in range(count)
+        )
+        theatre_hall = TheatreHall.objects.create(
+            name=BENCHMARK_NAME, rows=20, seats_in_row=20
+        )
+        Performance.objects.bulk_create(
+            Performance(play=play, theatre_hall=theatre_hall)
+            for play in plays
+        )
+
+        Play.genres.through.objects.bulk_create(
+            Play.genres.through(play_id=play.id, genre_id=genre.id)
+            for play in plays
+            for genre in genres[:3]
+        )
+        Play.actors.through.objects.bulk_create(
+            Play.actors.through(play_id=play.id, actor_id=actor.id)
+            for play in plays
+            for actor in actors[:5]
+        )
+
+        return [play.id for play in plays], theatre_hall, genres, actors
+
+    @staticmethod
+    def timed(function, repeat: int) -> float:
+        """Median milliseconds of repeat calls"""
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            function()
+            timings.append((time.perf_counter() - started) * 1000)
+
+        return statistics.median(timings)
+
+    def measure(self, name: str, data, repeat: int) -> None:
+        content = JSONRenderer().render(data)
+        if FastJSONRenderer().render(data) != content:
+            self.stdout.write(
+                self.style.ERROR(f"{name}: fast renderer output differs")
+            )
+
+        results = {
+            "render": (
+                self.timed(lambda: JSONRenderer().render(data), repeat),
+                self.timed(lambda: FastJSONRenderer().render(data), repeat),
+            ),
+            "parse": (
+                self.timed(
+                    lambda: JSONParser().parse(io.BytesIO(content)), repeat
+                ),
+                self.timed(
+                    lambda: FastJSONParser().parse(io.BytesIO(content)),
+                    repeat,
+                ),
+            ),
+        }
+
+        for step, (regular, fast) in results.items():
+            self.stdout.write(
+                f"{name} {step} ({len(content)} bytes): json {regular:.2f}ms, "
+                f"orjson {fast:.2f}ms, x{regular / fast:.1f}"
+            )
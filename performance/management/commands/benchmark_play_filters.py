@@ -0,0 +1,133 @@
+import random
+import statistics
+import time
+
+from django.core.management import BaseCommand
+from django.db import connection
+
+from performance.filters import filter_related
+from performance.models import Actor, Genre, Play
+
+
+BENCHMARK_NAME = "Play filter benchmark"
+
+
+def join_filter(queryset, genre_ids: list, actor_ids: list):
+    """Genres/actors filter as it was: JOIN both tables, then DISTINCT"""
+    return (
+        queryset.filter(genres__id__in=genre_ids)
+        .filter(actors__id__in=actor_ids)
+        .distinct()
+    )
+
+
+def exists_filter(queryset, genre_ids: list, actor_ids: list,
+                  match_all: bool = False):
+    queryset = filter_related(queryset, "genres", genre_ids, match_all)
+    return filter_related(queryset, "actors", actor_ids, match_all)
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a play catalogue and compare the JOIN + DISTINCT genre/actor "
+        "filter with the EXISTS one. Run against a local database only."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--plays", type=int, default=20_000)
+        parser.add_argument("--genres", type=int, default=20)
+        parser.add_argument("--actors", type=int, default=500)
+        parser.add_argument("--genres-per-play", type=int, default=3)
+        parser.add_argument("--actors-per-play", type=int, default=8)
+        parser.add_argument(
+            "--filter-size",
+            type=int,
+            default=3,
+            help="Genres and actors listed in the filter",
+        )
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument(
+            "--explain", action="store_true", help="Print the query plans"
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the seeded plays, genres and actors",
+        )
+
+    def handle(self, *args, **options):
+        genres, actors, plays = self.seed(options)
+
+        try:
+            genre_ids = random.sample(
+                [genre.id for genre in genres], options["filter_size"]
+            )
+            actor_ids = random.sample(
+                [actor.id for actor in actors], options["filter_size"]
+            )
+            queryset = Play.objects.filter(title=BENCHMARK_NAME)
+
+            variants = {
+                "join + distinct": join_filter(queryset, genre_ids, actor_ids),
+                "exists (any)": exists_filter(queryset, genre_ids, actor_ids),
+                "exists (all)": exists_filter(
+                    queryset, genre_ids, actor_ids, match_all=True
+                ),
+            }
+
+            for name, variant in variants.items():
+                self.measure(name, variant, options)
+
+            joined = {play.id for play in variants["join + distinct"]}
+            if joined != {play.id for play in variants["exists (any)"]}:
+                self.stdout.write(
+                    self.style.ERROR("JOIN and EXISTS filters disagree")
+                )
+        finally:
+            if not options["keep"]:
+                Play.objects.filter(id__in=plays).delete()
+                Genre.objects.filter(id__in=[g.id for g in genres]).delete()
+                Actor.objects.filter(id__in=[a.id for a in actors]).delete()
+
+    def seed(self, options) -> tuple:
+        genres = Genre.objects.bulk_create(
+            Genre(name=f"{BENCHMARK_NAME} {number}")
+            for number in range(options["genres"])
+        )
+        actors = Actor.objects.bulk_create(
+            Actor(first_name=BENCHMARK_NAME, last_name=str(number))
+            for number in range(options["actors"])
+        )
+        plays = Play.objects.bulk_create(
+            Play(title=BENCHMARK_NAME, description="x" * 2000)
+            for _ in range(options["plays"])
+        )
+
+        Play.genres.through.objects.bulk_create(
+            Play.genres.through(play_id=play.id, genre_id=genre.id)
+            for play in plays
+            for genre in random.sample(genres, options["genres_per_play"])
+        )
+        Play.actors.through.objects.bulk_create(
+            Play.actors.through(play_id=play.id, actor_id=actor.id)
+            for play in plays
+            for actor in random.sample(actors, options["actors_per_play"])
+        )
+
+        return genres, actors, [play.id for play in plays]
+
+    def measure(self, name: str, queryset, options) -> None:
+        timings = []
+        for _ in range(options["repeat"]):
+            started = time.perf_counter()
+            rows = len(list(queryset.all()))
+            timings.append((time.perf_counter() - started) * 1000)
+
+        self.stdout.write(
+            f"{name}: {rows} plays, median {statistics.median(timings):.1f}ms"
+            f", min {min(timings):.1f}ms"
+        )
+
+        if options["explain"]:
+            self.stdout.write(f"-- {connection.vendor} plan of {name}:")
+            self.stdout.write(queryset.explain())
@@ -0,0 +1,241 @@
+import random
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management import BaseCommand, CommandError
+from django.db import DatabaseError, IntegrityError, connection, connections
+from django.db.models import Count
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from performance.models import Performance, Play, TheatreHall, Ticket
+
+
+BENCHMARK_NAME = "Reservation benchmark"
+# database hosts the benchmark may seed without --force, "" is a socket
+LOCAL_HOSTS = ("", "localhost", "127.0.0.1", "::1")
+
+
+def percentile(values: list, percent: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    if not values:
+        return 0.0
+
+    rank = max(int(round(percent / 100 * len(values) + 0.5)) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+def reserve(user_id: int, performance_id: int, seats_per_request: int,
+            hot_rows: int, seats_in_row: int, retries: int) -> tuple:
+    """
+    Book a random block of seats in the hot rows as the given user,
+    picking another block on conflicts up to retries times.
+
+    Returns (outcome, latency in seconds, retries used).
+    """
+    client = APIClient(SERVER_NAME="localhost")
+    client.force_authenticate(get_user_model()(id=user_id))
+    url = reverse("performance:reservation-list")
+
+    started = time.perf_counter()
+    try:
+        for attempt in range(retries + 1):
+            row = random.randint(1, hot_rows)
+            first_seat = random.randint(
+                1, seats_in_row - seats_per_request + 1
+            )
+            payload = {
+                "tickets": [
+                    {"performance": performance_id, "row": row, "seat": seat}
+                    for seat in range(
+                        first_seat, first_seat + seats_per_request
+                    )
+                ]
+            }
+
+            try:
+                response = client.post(url, payload, format="json")
+            except IntegrityError:
+                outcome = "integrity_error"
+                continue
+            except DatabaseError:
+                outcome = "database_error"
+                continue
+
+            if response.status_code == 201:
+                outcome = "reserved"
+                break
+
+            if response.status_code in (400, 409):
+                outcome = "conflict"
+                continue
+
+            outcome = f"http_{response.status_code}"
+            break
+    finally:
+        connection.close()
+
+    return outcome, time.perf_counter() - started, attempt
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a performance and fire concurrent reservations at it. "
+        "Run against a local database only, it creates and removes data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--workers", type=int, default=16)
+        parser.add_argument(
+            "--pool", choices=("thread", "process"), default="thread"
+        )
+        parser.add_argument("--users", type=int, default=50)
+        parser.add_argument("--rows", type=int, default=30)
+        parser.add_argument("--seats-in-row", type=int, default=50)
+        parser.add_argument(
+            "--hot-rows",
+            type=int,
+            default=3,
+            help="Requests only target the first rows to provoke conflicts",
+        )
+        parser.add_argument("--seats-per-request", type=int, default=2)
+        parser.add_argument(
+            "--retries",
+            type=int,
+            default=2,
+            help="Times a client tries another block after a conflict",
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the seeded performance, tickets and users",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Run against a database on another host",
+        )
+
+    def handle(self, *args, **options):
+        host = connection.settings_dict["HOST"]
+        if host not in LOCAL_HOSTS and not options["force"]:
+            raise CommandError(
+                f"The database is on {host}, not local. The benchmark "
+                f"creates and removes data, pass --force to run it anyway."
+            )
+
+        if options["seats_per_request"] > options["seats_in_row"]:
+            raise CommandError("--seats-per-request exceeds --seats-in-row")
+
+        hot_rows = min(options["hot_rows"], options["rows"])
+        theatre_hall = TheatreHall.objects.create(
+            name=BENCHMARK_NAME,
+            rows=options["rows"],
+            seats_in_row=options["seats_in_row"],
+        )
+        play = Play.objects.create(
+            title=BENCHMARK_NAME, description=BENCHMARK_NAME
+        )
+        performance = Performance.objects.create(
+            play=play, theatre_hall=theatre_hall
+        )
+        run = uuid.uuid4().hex[:8]
+        users = get_user_model().objects.bulk_create(
+            get_user_model()(email=f"benchmark-{run}-{number}@theatre.local")
+            for number in range(options["users"])
+        )
+        user_ids = [user.id for user in users]
+
+        # forked workers must not share the parent's connection
+        connections.close_all()
+        pool_class = (
+            ProcessPoolExecutor if options["pool"] == "process"
+            else ThreadPoolExecutor
+        )
+
+        try:
+            started = time.perf_counter()
+            with pool_class(max_workers=options["workers"]) as pool:
+                results = list(
+                    pool.map(
+                        reserve,
+                        [random.choice(user_ids) for _ in range(
+                            options["requests"]
+                        )],
+                        [performance.id] * options["requests"],
+                        [options["seats_per_request"]] * options["requests"],
+                        [hot_rows] * options["requests"],
+                        [options["seats_in_row"]] * options["requests"],
+                        [options["retries"]] * options["requests"],
+                    )
+                )
+            elapsed = time.perf_counter() - started
+
+            self.report(results, elapsed)
+            self.check_oversell(performance)
+        finally:
+            if not options["keep"]:
+                performance.delete()
+                play.delete()
+                theatre_hall.delete()
+                get_user_model().objects.filter(id__in=user_ids).delete()
+
+    def report(self, results: list, elapsed: float) -> None:
+        outcomes = Counter(outcome for outcome, _, _ in results)
+        latencies = sorted(latency * 1000 for _, latency, _ in results)
+
+        self.stdout.write(
+            f"Requests: {len(results)} in {elapsed:.2f}s "
+            f"({len(results) / elapsed:.1f} req/s)"
+        )
+        for outcome, count in sorted(outcomes.items()):
+            self.stdout.write(f"  {outcome}: {count}")
+        self.stdout.write(
+            f"Retries: {sum(retries for _, _, retries in results)}"
+        )
+        self.stdout.write(
+            "Latency ms: "
+            + ", ".join(
+                f"p{percent} {percentile(latencies, percent):.1f}"
+                for percent in (50, 95, 99)
+            )
+        )
+
+    def check_oversell(self, performance: Performance) -> None:
+        performance.refresh_from_db()
+        theatre_hall = performance.theatre_hall
+        tickets = Ticket.objects.filter(performance=performance)
+
+        problems = []
+        sold = tickets.count()
+        if sold > theatre_hall.capacity:
+            problems.append(
+                f"{sold} tickets for {theatre_hall.capacity} seats"
+            )
+
+        duplicates = (
+            tickets.values("row", "seat")
+            .annotate(count=Count("id"))
+            .filter(count__gt=1)
+            .count()
+        )
+        if duplicates:
+            problems.append(f"{duplicates} seats sold more than once")
+
+        if performance.seats_sold != sold:
+            problems.append(
+                f"seats_sold counter is {performance.seats_sold}, "
+                f"tickets sold {sold}"
+            )
+
+        if problems:
+            for problem in problems:
+                self.stdout.write(self.style.ERROR(f"Oversell: {problem}"))
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(f"No oversell, {sold} tickets sold")
+            )
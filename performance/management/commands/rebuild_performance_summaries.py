@@ -0,0 +1,28 @@
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from performance.models import Performance, PerformanceSummary
+from performance.summaries import refresh_summaries
+
+
+class Command(BaseCommand):
+    help = "Rebuild the PerformanceSummary table from performances"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Summaries written per INSERT",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            PerformanceSummary.objects.all().delete()
+            rebuilt = refresh_summaries(
+                Performance.objects.all(), batch_size=options["batch_size"]
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{rebuilt} performance summaries rebuilt")
+        )
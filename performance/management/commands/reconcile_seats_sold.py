@@ -0,0 +1,76 @@
+from django.core.management import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from performance.models import ArchivedTicket, Performance, Ticket
+
+
+def sold_tickets(model):
+    """Tickets of model per performance, as a subquery"""
+    return Coalesce(
+        Subquery(
+            model.objects.filter(performance=OuterRef("pk"))
+            .order_by()
+            .values("performance")
+            .annotate(count=Count("pk"))
+            .values("count")
+        ),
+        Value(0),
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount Performance.seats_sold from tickets, archived ones "
+        "included, and fix drifted ones"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report performances with a wrong counter",
+        )
+
+    def handle(self, *args, **options):
+        drifted = list(
+            Performance.objects.annotate(
+                sold=sold_tickets(Ticket) + sold_tickets(ArchivedTicket)
+            )
+            .exclude(seats_sold=F("sold"))
+            .values_list("id", flat=True)
+        )
+
+        fixed = 0
+        for performance_id in drifted:
+            with transaction.atomic():
+                performance = Performance.objects.select_for_update().get(
+                    pk=performance_id
+                )
+                sold = (
+                    performance.tickets.count()
+                    + performance.archived_tickets.count()
+                )
+
+                if performance.seats_sold == sold:
+                    continue
+
+                self.stdout.write(
+                    f"Performance {performance.id}: "
+                    f"seats_sold {performance.seats_sold} -> {sold}"
+                )
+                fixed += 1
+
+                if not options["dry_run"]:
+                    performance.seats_sold = sold
+                    performance.save(
+                        update_fields=["seats_sold", "updated_at"]
+                    )
+
+        if options["dry_run"]:
+            self.stdout.write(f"{fixed} performance(s) to reconcile")
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(f"{fixed} performance(s) reconciled")
+            )
@@ -0,0 +1,87 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management import BaseCommand
+from django.db import connections
+
+from performance.models import ReservationRequest
+from performance.reservations import process_performance_queue
+
+
+class Command(BaseCommand):
+    help = (
+        "Book queued reservations (RESERVATION_ASYNC). Every performance "
+        "queue is handled by one process at a time, in request order."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=multiprocessing.cpu_count(),
+            help="Number of performance queues processed in parallel",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait between checks for new requests",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit as soon as the queue is empty",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("Reservation worker started")
+        in_flight = {}
+
+        with ProcessPoolExecutor(
+            max_workers=options["processes"],
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=django.setup,
+        ) as pool:
+            while True:
+                for performance_id, future in list(in_flight.items()):
+                    if future.done():
+                        del in_flight[performance_id]
+                        self.report(performance_id, future)
+
+                pending = set(
+                    ReservationRequest.objects.filter(
+                        status=ReservationRequest.Status.PENDING
+                    )
+                    .exclude(performance_id__in=in_flight)
+                    .order_by()
+                    .values_list("performance_id", flat=True)
+                    .distinct()
+                )
+                connections.close_all()
+
+                for performance_id in pending:
+                    in_flight[performance_id] = pool.submit(
+                        process_performance_queue, performance_id
+                    )
+
+                if options["once"] and not in_flight:
+                    break
+
+                time.sleep(options["poll_interval"])
+
+    def report(self, performance_id: int, future) -> None:
+        try:
+            processed = future.result()
+        except Exception as error:
+            self.stderr.write(
+                self.style.ERROR(
+                    f"Performance {performance_id} queue failed: {error!r}"
+                )
+            )
+        else:
+            self.stdout.write(
+                f"Performance {performance_id}: "
+                f"{processed} request(s) processed"
+            )
@@ -1,19 +1,45 @@
 import time
 
-from django.core.management import BaseCommand
+from django.core.management import BaseCommand, CommandError
 from django.db import connection
 from django.db.utils import OperationalError
 
 
 class Command(BaseCommand):
+    help = "Wait until the database accepts connections, backing off"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=60,
+            help="Give up after this many seconds",
+        )
+        parser.add_argument(
+            "--max-delay",
+            type=float,
+            default=5,
+            help="Longest pause between two attempts in seconds",
+        )
+
     def handle(self, *args, **options):
         self.stdout.write("Wait for database...")
-        db_connection = None
-        while not db_connection:
+        deadline = time.monotonic() + options["timeout"]
+        delay = 0.1
+
+        while True:
             try:
                 connection.ensure_connection()
-                db_connection = True
-            except OperationalError:
-                self.stdout.write("Database not ready, waiting 1 sec...")
-                time.sleep(1)
+                break
+            except OperationalError as error:
+                if time.monotonic() + delay > deadline:
+                    raise CommandError(f"Database not ready: {error}")
+
+                self.stdout.write(
+                    f"Database not ready ({str(error).strip()}), "
+                    f"waiting {delay:.1f} sec..."
+                )
+                time.sleep(delay)
+                delay = min(delay * 2, options["max_delay"])
+
         self.stdout.write(self.style.SUCCESS("Database ready"))
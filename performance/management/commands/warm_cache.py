@@ -0,0 +1,33 @@
+from django.core.cache import cache
+from django.core.management import BaseCommand
+from django.urls import reverse
+
+from performance.cache import list_cache_key
+from performance.views import ActorViewSet, GenreViewSet, TheatreHallViewSet
+
+
+# the most requested lists first, so they are ready the soonest
+WARM_UP_ORDER = (
+    ("performance:genre-list", GenreViewSet),
+    ("performance:actor-list", ActorViewSet),
+    ("performance:theatrehall-list", TheatreHallViewSet),
+)
+
+
+class Command(BaseCommand):
+    help = "Fill the cache of reference lists (genres, actors, halls)"
+
+    def handle(self, *args, **options):
+        for url_name, viewset in WARM_UP_ORDER:
+            model = viewset.queryset.model
+            serializer = viewset.serializer_class(
+                model.objects.all(), many=True
+            )
+            cache.set(
+                list_cache_key(model, reverse(url_name)),
+                serializer.data,
+                timeout=viewset.list_cache_timeout,
+            )
+            self.stdout.write(f"{url_name}: {len(serializer.data)} cached")
+
+        self.stdout.write(self.style.SUCCESS("Cache warmed up"))
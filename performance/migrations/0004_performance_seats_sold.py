@@ -0,0 +1,28 @@
+# Generated by Django 4.2.4 on 2026-10-18 01:39
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_seats_sold(apps, schema_editor):
+    Performance = apps.get_model("performance", "Performance")
+
+    performances = Performance.objects.annotate(sold=Count("tickets"))
+    for performance in performances.filter(sold__gt=0):
+        performance.seats_sold = performance.sold
+        performance.save(update_fields=["seats_sold"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("performance", "0003_seathold"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="performance",
+            name="seats_sold",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_seats_sold, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,94 @@
+# Generated by Django 4.2.4 on 2026-10-18 02:05
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Concat
+
+
+class AddPostgresIndex(migrations.AddIndex):
+    """GIN indexes only exist on PostgreSQL, other backends search without"""
+
+    def database_forwards(self, app_label, schema_editor, *args):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, *args)
+
+    def database_backwards(self, app_label, schema_editor, *args):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, *args)
+
+
+def fill_search_vectors(apps, schema_editor):
+    # frozen copy of performance.search.play_search_vector
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    Play = apps.get_model("performance", "Play")
+
+    def names(expression):
+        return Subquery(
+            Play.objects.filter(pk=OuterRef("pk"))
+            .order_by()
+            .values("pk")
+            .annotate(names=StringAgg(expression, delimiter=" "))
+            .values("names")
+        )
+
+    Play.objects.update(
+        search_vector=(
+            django.contrib.postgres.search.SearchVector(
+                "title", weight="A", config="english"
+            )
+            + django.contrib.postgres.search.SearchVector(
+                names(
+                    Concat(
+                        "actors__first_name", Value(" "), "actors__last_name"
+                    )
+                ),
+                weight="B",
+                config="english",
+            )
+            + django.contrib.postgres.search.SearchVector(
+                names("genres__name"), weight="B", config="english"
+            )
+            + django.contrib.postgres.search.SearchVector(
+                "description", weight="C", config="english"
+            )
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("performance", "0007_performance_schedule_indexes"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name="play",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(fill_search_vectors, migrations.RunPython.noop),
+        AddPostgresIndex(
+            model_name="play",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="performance_play_search_idx"
+            ),
+        ),
+        AddPostgresIndex(
+            model_name="play",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    "title", name="gin_trgm_ops"
+                ),
+                name="performance_play_trgm_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.4 on 2026-10-18 02:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("performance", "0008_play_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="play",
+            index=models.Index(
+                fields=["title", "id"], name="performance_play_title_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                fields=["user", "-created_at"],
+                name="performance_user_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,100 @@
+# Generated by Django 4.2.4 on 2026-10-18 02:16
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_summaries(apps, schema_editor):
+    Performance = apps.get_model("performance", "Performance")
+    PerformanceSummary = apps.get_model("performance", "PerformanceSummary")
+
+    PerformanceSummary.objects.bulk_create(
+        (
+            PerformanceSummary(
+                performance=performance,
+                show_time=performance.show_time,
+                play=performance.play,
+                play_title=performance.play.title,
+                play_image=performance.play.image.name,
+                theatre_hall=performance.theatre_hall,
+                theatre_hall_name=performance.theatre_hall.name,
+                # historical models have no TheatreHall.capacity property
+                theatre_hall_capacity=(
+                    performance.theatre_hall.rows
+                    * performance.theatre_hall.seats_in_row
+                ),
+                seats_sold=performance.seats_sold,
+            )
+            for performance in Performance.objects.select_related(
+                "play", "theatre_hall"
+            ).iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("performance", "0009_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PerformanceSummary",
+            fields=[
+                (
+                    "performance",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="summary",
+                        serialize=False,
+                        to="performance.performance",
+                    ),
+                ),
+                ("show_time", models.DateTimeField()),
+                ("play_title", models.CharField(max_length=63)),
+                (
+                    "play_image",
+                    models.ImageField(blank=True, null=True, upload_to=""),
+                ),
+                ("theatre_hall_name", models.CharField(max_length=63)),
+                ("theatre_hall_capacity", models.PositiveIntegerField()),
+                ("seats_sold", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "play",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="performance.play",
+                    ),
+                ),
+                (
+                    "theatre_hall",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="performance.theatrehall",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-show_time"],
+                "indexes": [
+                    models.Index(
+                        fields=["play", "show_time"],
+                        name="summary_play_show_idx",
+                    ),
+                    models.Index(
+                        fields=["theatre_hall", "show_time"],
+                        name="summary_hall_show_idx",
+                    ),
+                    models.Index(
+                        fields=["show_time"], name="summary_show_idx"
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(fill_summaries, migrations.RunPython.noop),
+    ]
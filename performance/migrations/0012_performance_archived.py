@@ -0,0 +1,26 @@
+# Generated by Django 4.2.4 on 2026-10-18 02:42
+
+from django.db import migrations, models
+
+
+def mark_archived(apps, schema_editor):
+    Performance = apps.get_model("performance", "Performance")
+
+    Performance.objects.filter(archived_tickets__isnull=False).update(
+        archived=True
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("performance", "0011_archivedticket"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="performance",
+            name="archived",
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.RunPython(mark_archived, migrations.RunPython.noop),
+    ]
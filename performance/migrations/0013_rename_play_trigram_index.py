@@ -0,0 +1,22 @@
+# Generated by Django 4.2.4 on 2026-10-18 12:40
+
+from django.db import migrations
+
+
+def rename_trigram_index(apps, schema_editor):
+    # 0008 used to create it with a name longer than Django allows
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "ALTER INDEX IF EXISTS performance_play_title_trgm_idx "
+            "RENAME TO performance_play_trgm_idx"
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("performance", "0012_performance_archived"),
+    ]
+
+    operations = [
+        migrations.RunPython(rename_trigram_index, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,8 @@
 import os
 import uuid
 
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.conf import settings
 from django.utils.text import slugify
@@ -71,9 +73,25 @@ class Play(models.Model):
         upload_to=play_image_file_path,
         blank=True
     )
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    # kept up to date by performance.signals, see performance.search
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         ordering = ["title"]
+        indexes = [
+            models.Index(
+                fields=["title", "id"], name="performance_play_title_idx"
+            ),
+            # full-text and trigram search, PostgreSQL only
+            GinIndex(
+                fields=["search_vector"], name="performance_play_search_idx"
+            ),
+            GinIndex(
+                OpClass("title", name="gin_trgm_ops"),
+                name="performance_play_trgm_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -91,9 +109,73 @@ class Performance(models.Model):
         on_delete=models.CASCADE,
         related_name="performances"
     )
+    seats_sold = models.PositiveIntegerField(default=0, editable=False)
+    # set by archive_performances, its seats can't be sold anymore
+    archived = models.BooleanField(default=False, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    @property
+    def tickets_available(self) -> int:
+        return self.theatre_hall.capacity - self.seats_sold
 
     class Meta:
         ordering = ["-show_time"]
+        indexes = [
+            models.Index(
+                fields=["play", "show_time"],
+                name="performance_play_show_idx",
+            ),
+            models.Index(
+                fields=["theatre_hall", "show_time"],
+                name="performance_hall_show_idx",
+            ),
+            models.Index(fields=["show_time"], name="performance_show_idx"),
+        ]
+
+
+class PerformanceSummary(models.Model):
+    """
+    Read model of the schedule: what the performance list shows, one row
+    per performance, kept up to date by performance.summaries
+    """
+
+    performance = models.OneToOneField(
+        to=Performance,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="summary",
+    )
+    show_time = models.DateTimeField()
+    play = models.ForeignKey(
+        to=Play, on_delete=models.CASCADE, related_name="+"
+    )
+    play_title = models.CharField(max_length=63)
+    play_image = models.ImageField(null=True, blank=True)
+    theatre_hall = models.ForeignKey(
+        to=TheatreHall, on_delete=models.CASCADE, related_name="+"
+    )
+    theatre_hall_name = models.CharField(max_length=63)
+    theatre_hall_capacity = models.PositiveIntegerField()
+    seats_sold = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def tickets_available(self) -> int:
+        return self.theatre_hall_capacity - self.seats_sold
+
+    class Meta:
+        ordering = ["-show_time"]
+        indexes = [
+            models.Index(
+                fields=["play", "show_time"],
+                name="summary_play_show_idx",
+            ),
+            models.Index(
+                fields=["theatre_hall", "show_time"],
+                name="summary_hall_show_idx",
+            ),
+            models.Index(fields=["show_time"], name="summary_show_idx"),
+        ]
 
 
 class Reservation(models.Model):
@@ -102,11 +184,22 @@ class Reservation(models.Model):
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE
     )
 
+    @property
+    def history(self) -> list:
+        """Tickets of the reservation including the archived ones"""
+        return [*self.tickets.all(), *self.archived_tickets.all()]
+
     def __str__(self):
         return str(self.created_at)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["user", "-created_at"],
+                name="performance_user_created_idx",
+            )
+        ]
 
 
 class Ticket(models.Model):
@@ -118,6 +211,7 @@ class Ticket(models.Model):
     )
     row = models.IntegerField()
     seat = models.IntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
 
     @staticmethod
     def validate_ticket(row, seat, theatre_hall, error_to_raise):
@@ -164,3 +258,88 @@ class Ticket(models.Model):
     class Meta:
         unique_together = ("performance", "row", "seat")
         ordering = ["row", "seat"]
+
+
+class ArchivedTicket(models.Model):
+    """
+    Ticket of a finished performance moved out of the Ticket table by
+    archive_performances; it keeps the id and seat of the original one
+    """
+
+    performance = models.ForeignKey(
+        Performance, on_delete=models.CASCADE, related_name="archived_tickets"
+    )
+    reservation = models.ForeignKey(
+        Reservation, on_delete=models.CASCADE, related_name="archived_tickets"
+    )
+    row = models.IntegerField()
+    seat = models.IntegerField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return (
+            f"{str(self.performance)} (row: {self.row}, seat: {self.seat}) "
+            f"archived"
+        )
+
+    class Meta:
+        ordering = ["row", "seat"]
+
+
+class SeatHold(models.Model):
+    performance = models.ForeignKey(
+        Performance, on_delete=models.CASCADE, related_name="holds"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE
+    )
+    row = models.IntegerField()
+    seat = models.IntegerField()
+    expires_at = models.DateTimeField()
+
+    def __str__(self):
+        return (
+            f"{str(self.performance)} (row: {self.row}, seat: {self.seat}) "
+            f"held until {self.expires_at}"
+        )
+
+    class Meta:
+        unique_together = ("performance", "row", "seat")
+        ordering = ["row", "seat"]
+
+
+class ReservationRequest(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        DONE = "done"
+        FAILED = "failed"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE
+    )
+    performance = models.ForeignKey(
+        Performance,
+        on_delete=models.CASCADE,
+        related_name="reservation_requests",
+    )
+    tickets = models.JSONField()
+    status = models.CharField(
+        max_length=15, choices=Status.choices, default=Status.PENDING
+    )
+    reservation = models.ForeignKey(
+        Reservation, on_delete=models.SET_NULL, null=True, blank=True
+    )
+    errors = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.id} ({self.status})"
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["status", "performance", "created_at"]),
+        ]
@@ -0,0 +1,111 @@
+import hashlib
+import json
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+
+def estimate_count(queryset, exact_limit: int) -> int:
+    """
+    Number of rows of the queryset. On PostgreSQL the planner estimate
+    is used once it exceeds exact_limit, so big tables are not scanned.
+    """
+    if connection.vendor == "postgresql":
+        plan = json.loads(queryset.order_by().explain(format="json"))
+        estimate = plan[0]["Plan"]["Plan Rows"]
+        if estimate > exact_limit:
+            return estimate
+
+    return queryset.count()
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination: every page is a WHERE on the first ordering field
+    plus LIMIT, so deep pages cost the same as the first one.
+
+    With ?with_count=true the page also carries the total count, cached
+    for PAGINATION_COUNT_CACHE_TIMEOUT seconds and estimated on big tables.
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    count_query_param = "with_count"
+    exact_count_limit = 10_000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = None
+
+        if request.query_params.get(self.count_query_param) in ("1", "true"):
+            self.count = self.get_count(queryset)
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_count(self, queryset) -> int:
+        sql, params = queryset.order_by().query.sql_with_params()
+        key = "pagination-count:" + hashlib.md5(
+            f"{sql}{params}".encode()
+        ).hexdigest()
+
+        return cache.get_or_set(
+            key,
+            lambda: estimate_count(queryset, self.exact_count_limit),
+            settings.PAGINATION_COUNT_CACHE_TIMEOUT,
+        )
+
+    def get_paginated_response(self, data):
+        page = [
+            ("next", self.get_next_link()),
+            ("previous", self.get_previous_link()),
+            ("results", data),
+        ]
+
+        if self.count is not None:
+            page.insert(0, ("count", self.count))
+
+        return Response(OrderedDict(page))
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"] = {
+            "count": {
+                "type": "integer",
+                "example": 123,
+                "description": (
+                    f"Only with ?{self.count_query_param}=true, "
+                    "may be estimated"
+                ),
+            },
+            **response_schema["properties"],
+        }
+        return response_schema
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Include the total count of results",
+                "schema": {"type": "boolean"},
+            }
+        ]
+
+
+class PerformancePagination(KeysetPagination):
+    # pk, as PerformanceSummary rows have no id of their own
+    ordering = ("-show_time", "pk")
+
+
+class PlayPagination(KeysetPagination):
+    ordering = ("title", "id")
+
+
+class ReservationPagination(KeysetPagination):
+    page_size = 5
+    ordering = ("-created_at", "id")
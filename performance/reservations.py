@@ -0,0 +1,385 @@
+import random
+import time
+from collections import Counter
+from datetime import timedelta
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db import IntegrityError, OperationalError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from performance.exceptions import SeatsUnavailable
+from performance.models import (
+    Performance,
+    Reservation,
+    ReservationRequest,
+    SeatHold,
+    Ticket,
+)
+from performance.summaries import add_seats_sold
+
+
+SEAT_TAKEN_MESSAGE = (
+    "The fields performance, row, seat must make a unique set."
+)
+SEAT_HELD_MESSAGE = "This seat is held by another customer."
+PERFORMANCE_ARCHIVED_MESSAGE = "This performance has already taken place."
+
+
+def seat_key(ticket_data: dict) -> tuple:
+    """(performance_id, row, seat) triple identifying a seat"""
+    return (
+        ticket_data["performance"].id,
+        ticket_data["row"],
+        ticket_data["seat"],
+    )
+
+
+def ticket_seat_key(ticket: Ticket) -> tuple:
+    """(performance_id, row, seat) triple of a Ticket instance"""
+    return ticket.performance_id, ticket.row, ticket.seat
+
+
+def seats_filter(seats) -> Q:
+    """Match exactly the given (performance_id, row, seat) triples"""
+    return reduce(
+        or_,
+        (
+            Q(performance_id=performance_id, row=row, seat=seat)
+            for performance_id, row, seat in seats
+        ),
+        Q(pk__in=[]),
+    )
+
+
+def _seats_in(queryset, seats) -> set:
+    """Return which (performance_id, row, seat) triples are in queryset"""
+    seats = set(seats)
+
+    if not seats:
+        return set()
+
+    found = queryset.filter(
+        performance_id__in={performance_id for performance_id, _, _ in seats},
+        row__in={row for _, row, _ in seats},
+        seat__in={seat for _, _, seat in seats},
+    ).values_list("performance_id", "row", "seat")
+
+    return seats.intersection(found)
+
+
+def taken_seats(seats) -> set:
+    """Return the (performance_id, row, seat) triples which are sold"""
+    return _seats_in(Ticket.objects.all(), seats)
+
+
+def held_seats(seats, user=None) -> set:
+    """
+    Return the (performance_id, row, seat) triples which are held
+    by anyone but the given user
+    """
+    holds = SeatHold.objects.filter(expires_at__gt=timezone.now())
+
+    if user is not None:
+        holds = holds.exclude(user=user)
+
+    return _seats_in(holds, seats)
+
+
+def validate_seats(seats, field_name: str, user=None) -> None:
+    """
+    Check all seats with two queries and report sold, held or repeated
+    ones per seat under field_name, like UniqueTogetherValidator does
+    """
+    taken = taken_seats(seats)
+    held = held_seats(seats, user) - taken
+
+    errors = []
+    requested = set()
+    for seat in seats:
+        if seat in taken or seat in requested:
+            errors.append({"non_field_errors": [SEAT_TAKEN_MESSAGE]})
+        elif seat in held:
+            errors.append({"non_field_errors": [SEAT_HELD_MESSAGE]})
+        else:
+            errors.append({})
+        requested.add(seat)
+
+    if any(errors):
+        raise ValidationError({field_name: errors}, code="unique")
+
+
+def validate_not_archived(performances, field_name: str) -> None:
+    """Archived performances have passed, their seats can't be sold"""
+    if any(performance.archived for performance in performances):
+        raise ValidationError({field_name: PERFORMANCE_ARCHIVED_MESSAGE})
+
+
+def validate_seats_available(tickets_data, user=None) -> None:
+    """Report sold, held by others or repeated seats of the tickets"""
+    validate_not_archived(
+        [ticket_data["performance"] for ticket_data in tickets_data],
+        "tickets",
+    )
+    validate_seats(
+        [seat_key(ticket_data) for ticket_data in tickets_data],
+        "tickets",
+        user,
+    )
+
+
+def occupied_seats(performance, user=None):
+    """
+    (row, seat) pairs of the performance which are sold or held by
+    anyone but the given user, fetched with a single query
+    """
+    holds = SeatHold.objects.filter(
+        performance=performance, expires_at__gt=timezone.now()
+    )
+
+    if user is not None:
+        holds = holds.exclude(user=user)
+
+    return (
+        Ticket.objects.filter(performance=performance)
+        .order_by()
+        .values_list("row", "seat")
+        .union(holds.order_by().values_list("row", "seat"), all=True)
+    )
+
+
+def active_holds(performance, user):
+    """Seats the user still holds for the performance"""
+    return SeatHold.objects.filter(
+        performance=performance,
+        user=user,
+        expires_at__gt=timezone.now(),
+    )
+
+
+def hold_seats(performance, user, seats, minutes: int) -> list:
+    """
+    Hold (row, seat) pairs of the performance for the user.
+
+    Expired holds of the performance are reclaimed first; seats already
+    held by the user get their hold extended. Sold seats or seats held
+    by somebody else are reported and nothing is held.
+    """
+    keys = [(performance.id, row, seat) for row, seat in seats]
+    expires_at = timezone.now() + timedelta(minutes=minutes)
+
+    validate_not_archived([performance], "seats")
+
+    with transaction.atomic():
+        SeatHold.objects.filter(
+            performance=performance, expires_at__lte=timezone.now()
+        ).delete()
+        validate_seats(keys, "seats", user)
+
+        SeatHold.objects.filter(seats_filter(keys), user=user).delete()
+        holds = [
+            SeatHold(
+                performance=performance,
+                user=user,
+                row=row,
+                seat=seat,
+                expires_at=expires_at,
+            )
+            for _, row, seat in sorted(keys)
+        ]
+
+        try:
+            with transaction.atomic():
+                return SeatHold.objects.bulk_create(holds)
+        except IntegrityError:
+            validate_seats(keys, "seats", user)
+            raise
+
+
+def release_holds(performance, user) -> None:
+    """Drop all seat holds of the user for the performance"""
+    SeatHold.objects.filter(performance=performance, user=user).delete()
+
+
+def insert_tickets(reservation, tickets: list) -> None:
+    """
+    Insert tickets, reporting seats sold by a concurrent reservation
+    the same way as validate_seats_available does
+    """
+    try:
+        with transaction.atomic():
+            Ticket.objects.bulk_create(sorted(tickets, key=ticket_seat_key))
+    except IntegrityError:
+        validate_seats(
+            [ticket_seat_key(ticket) for ticket in tickets],
+            "tickets",
+            reservation.user,
+        )
+        raise
+
+
+def claim_tickets(reservation, tickets: list) -> None:
+    """
+    Insert tickets skipping seats somebody else already has
+    (INSERT ... ON CONFLICT DO NOTHING), so a conflict never aborts the
+    transaction, then raise SeatsUnavailable with the seats lost
+    """
+    Ticket.objects.bulk_create(
+        sorted(tickets, key=ticket_seat_key), ignore_conflicts=True
+    )
+
+    claimed = Ticket.objects.filter(reservation=reservation).values_list(
+        "performance_id", "row", "seat"
+    )
+    lost = set(map(ticket_seat_key, tickets)).difference(claimed)
+
+    if lost:
+        raise SeatsUnavailable(lost)
+
+
+def create_reservation(tickets_data, **reservation_data) -> Reservation:
+    """
+    Create a Reservation with all its tickets in one INSERT.
+
+    Tickets must be validated beforehand (Ticket.validate_ticket and
+    validate_seats_available): bulk_create does not call Ticket.save().
+    Seats sold by a concurrent reservation in the meantime are reported
+    as validation errors by the "bulk" RESERVATION_ENGINE and as
+    SeatsUnavailable (409) by the "claim" one. Deadlocks and other
+    transient database errors are retried RESERVATION_RETRIES times
+    with a randomized backoff.
+
+    Holds the user had on the booked seats are converted, i.e. removed,
+    and the seats_sold counters of the performances and their summaries
+    are increased. Performances archived in the meantime are reported
+    as validation errors: their counter is not updated.
+    """
+    insert = (
+        claim_tickets if settings.RESERVATION_ENGINE == "claim"
+        else insert_tickets
+    )
+
+    for attempt in range(settings.RESERVATION_RETRIES + 1):
+        try:
+            with transaction.atomic():
+                return _create_reservation(
+                    insert, tickets_data, **reservation_data
+                )
+        except OperationalError:
+            if attempt == settings.RESERVATION_RETRIES:
+                raise
+            time.sleep(
+                random.uniform(0, settings.RESERVATION_RETRY_DELAY)
+                * 2 ** attempt
+            )
+
+
+def _create_reservation(insert, tickets_data, **reservation_data):
+    reservation = Reservation.objects.create(**reservation_data)
+    tickets = [
+        Ticket(reservation=reservation, **ticket_data)
+        for ticket_data in tickets_data
+    ]
+    insert(reservation, tickets)
+
+    SeatHold.objects.filter(
+        seats_filter(map(seat_key, tickets_data)),
+        user=reservation.user,
+    ).delete()
+
+    sold = Counter(ticket.performance_id for ticket in tickets)
+    for performance_id, count in sorted(sold.items()):
+        updated = Performance.objects.filter(
+            pk=performance_id, archived=False
+        ).update(
+            seats_sold=F("seats_sold") + count, updated_at=timezone.now()
+        )
+        if not updated:
+            # archived after the tickets were validated
+            raise ValidationError({"tickets": PERFORMANCE_ARCHIVED_MESSAGE})
+    add_seats_sold(sold)
+
+    return reservation
+
+
+def enqueue_reservation(tickets_data, user) -> ReservationRequest:
+    """
+    Queue validated tickets to be booked by run_reservation_worker.
+
+    Requests are processed in order per performance; one touching
+    several performances is queued under the first of them.
+    """
+    return ReservationRequest.objects.create(
+        user=user,
+        performance=min(
+            (ticket_data["performance"] for ticket_data in tickets_data),
+            key=lambda performance: performance.id,
+        ),
+        tickets=[
+            {"performance": performance_id, "row": row, "seat": seat}
+            for performance_id, row, seat in map(seat_key, tickets_data)
+        ],
+    )
+
+
+def process_next_request(performance_id: int) -> bool:
+    """
+    Book the oldest pending request of the performance and record
+    its outcome; return False when the queue is empty
+    """
+    with transaction.atomic():
+        reservation_request = (
+            ReservationRequest.objects.select_for_update(
+                skip_locked=True, of=("self",)
+            )
+            .select_related("user")
+            .filter(
+                performance_id=performance_id,
+                status=ReservationRequest.Status.PENDING,
+            )
+            .first()
+        )
+
+        if reservation_request is None:
+            return False
+
+        performances = Performance.objects.in_bulk(
+            {ticket["performance"] for ticket in reservation_request.tickets}
+        )
+        tickets_data = [
+            {**ticket, "performance": performances[ticket["performance"]]}
+            for ticket in reservation_request.tickets
+            if ticket["performance"] in performances
+        ]
+
+        try:
+            if len(tickets_data) != len(reservation_request.tickets):
+                raise ValidationError(
+                    {"tickets": "The performance does not exist anymore."}
+                )
+            validate_seats_available(tickets_data, reservation_request.user)
+            reservation_request.reservation = create_reservation(
+                tickets_data, user=reservation_request.user
+            )
+            reservation_request.status = ReservationRequest.Status.DONE
+        except (ValidationError, SeatsUnavailable) as error:
+            reservation_request.errors = error.detail
+            reservation_request.status = ReservationRequest.Status.FAILED
+
+        reservation_request.processed_at = timezone.now()
+        reservation_request.save()
+
+    return True
+
+
+def process_performance_queue(performance_id: int) -> int:
+    """Book pending requests of the performance one by one, in order"""
+    processed = 0
+
+    while process_next_request(performance_id):
+        processed += 1
+
+    return processed
@@ -0,0 +1,86 @@
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramSimilarity,
+)
+from django.db import connection
+from django.db.models import F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Concat
+
+
+SEARCH_CONFIG = "english"
+
+
+def search_enabled() -> bool:
+    """Full-text and trigram search need PostgreSQL"""
+    return connection.vendor == "postgresql"
+
+
+def _names(play_model, expression):
+    """Space separated names of related objects of the outer play"""
+    return Subquery(
+        play_model.objects.filter(pk=OuterRef("pk"))
+        .order_by()
+        .values("pk")
+        .annotate(names=StringAgg(expression, delimiter=" "))
+        .values("names")
+    )
+
+
+def play_search_vector(play_model) -> SearchVector:
+    """
+    Weighted document of a play: title first, then actor and genre
+    names, then the description
+    """
+    return (
+        SearchVector("title", weight="A", config=SEARCH_CONFIG)
+        + SearchVector(
+            _names(
+                play_model,
+                Concat(
+                    "actors__first_name", Value(" "), "actors__last_name"
+                ),
+            ),
+            weight="B",
+            config=SEARCH_CONFIG,
+        )
+        + SearchVector(
+            _names(play_model, "genres__name"),
+            weight="B",
+            config=SEARCH_CONFIG,
+        )
+        + SearchVector("description", weight="C", config=SEARCH_CONFIG)
+    )
+
+
+def update_search_vectors(plays) -> None:
+    """Recompute Play.search_vector of the plays queryset in one UPDATE"""
+    if search_enabled():
+        plays.update(search_vector=play_search_vector(plays.model))
+
+
+def search_plays(plays, search: str):
+    """
+    Plays matching search, best first.
+
+    On PostgreSQL plays match the stored search vector (websearch syntax)
+    or have a title similar to search, which tolerates typos. Other
+    databases fall back to a case insensitive title/description match.
+    """
+    if not search_enabled():
+        return plays.filter(
+            Q(title__icontains=search) | Q(description__icontains=search)
+        )
+
+    query = SearchQuery(search, search_type="websearch", config=SEARCH_CONFIG)
+
+    return (
+        plays.annotate(
+            rank=SearchRank(F("search_vector"), query),
+            similarity=TrigramSimilarity("title", search),
+        )
+        .filter(Q(search_vector=query) | Q(title__trigram_similar=search))
+        .order_by("-rank", "-similarity", "title")
+    )
@@ -0,0 +1,76 @@
+def seat_index(row: int, seat: int, seats_in_row: int) -> int:
+    """Position of a seat in a row-major hall layout, starting from 0"""
+    return (row - 1) * seats_in_row + seat - 1
+
+
+def pack_seats(rows: int, seats_in_row: int, seats) -> bytes:
+    """
+    Pack (row, seat) pairs into a bitset of rows * seats_in_row bits.
+
+    Seats are laid out row by row; the first seat of the hall is the
+    most significant bit of the first byte.
+    """
+    bitmap = bytearray((rows * seats_in_row + 7) // 8)
+
+    for row, seat in seats:
+        index = seat_index(row, seat, seats_in_row)
+        bitmap[index >> 3] |= 0x80 >> (index & 7)
+
+    return bytes(bitmap)
+
+
+def free_intervals(seats_in_row: int, taken) -> list:
+    """Return (first, last) seat numbers of free runs in a row"""
+    intervals = []
+    start = 1
+
+    for seat in sorted(set(taken)):
+        if seat > start:
+            intervals.append((start, seat - 1))
+        start = max(start, seat + 1)
+
+    if start <= seats_in_row:
+        intervals.append((start, seats_in_row))
+
+    return intervals
+
+
+def best_block(rows: int, seats_in_row: int, seats, count: int) -> list:
+    """
+    Find count adjacent free seats closest to the centre of the hall.
+
+    Rows nearest to the middle of the hall are preferred, then blocks
+    nearest to the middle of the row. Returns (row, seat) pairs of the
+    block or an empty list when no row has enough adjacent free seats.
+    """
+    taken_by_row = {}
+    for row, seat in seats:
+        taken_by_row.setdefault(row, []).append(seat)
+
+    middle_row = (rows + 1) / 2
+    middle_seat = (seats_in_row + 1) / 2
+    ideal_start = round(middle_seat - (count - 1) / 2)
+
+    best = None
+    for row in range(1, rows + 1):
+        for first, last in free_intervals(
+            seats_in_row, taken_by_row.get(row, ())
+        ):
+            if last - first + 1 < count:
+                continue
+
+            start = min(max(ideal_start, first), last - count + 1)
+            score = (
+                abs(row - middle_row),
+                abs(start + (count - 1) / 2 - middle_seat),
+                row,
+                start,
+            )
+            if best is None or score < best:
+                best = score
+
+    if best is None:
+        return []
+
+    *_, row, start = best
+    return [(row, seat) for seat in range(start, start + count)]
@@ -1,36 +1,56 @@
-from django.db import transaction
+from django.conf import settings
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
+from performance.fieldsets import Expansion, SparseFieldsSerializerMixin
 from performance.models import (
     Actor,
     Genre,
     TheatreHall,
     Play,
     Performance,
-    Ticket, Reservation,
+    PerformanceSummary,
+    Ticket, Reservation, ReservationRequest,
+)
+from performance.reservations import (
+    active_holds,
+    create_reservation,
+    enqueue_reservation,
+    hold_seats,
+    validate_not_archived,
+    validate_seats_available,
 )
 
 
-class ActorSerializer(serializers.ModelSerializer):
+class ActorSerializer(
+    SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
     class Meta:
         model = Actor
         fields = ("id", "first_name", "last_name", "full_name")
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(
+    SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
     class Meta:
         model = Genre
         fields = ("id", "name")
 
 
-class TheatreHallSerializer(serializers.ModelSerializer):
+class TheatreHallSerializer(
+    SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
     class Meta:
         model = TheatreHall
         fields = ("id", "name", "rows", "seats_in_row", "capacity")
 
 
-class PlaySerializer(serializers.ModelSerializer):
+class PlaySerializer(
+    SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
+    prefetch_related_fields = {"genres": ("genres",), "actors": ("actors",)}
+
     class Meta:
         model = Play
         fields = ("id", "title", "description", "genres", "actors")
@@ -43,6 +63,10 @@ class PlayListSerializer(PlaySerializer):
     actors = serializers.SlugRelatedField(
         many=True, read_only=True, slug_field="full_name"
     )
+    expandable_fields = {
+        "genres": Expansion(GenreSerializer, many=True),
+        "actors": Expansion(ActorSerializer, many=True),
+    }
 
     class Meta:
         model = Play
@@ -71,7 +95,9 @@ class PlayImageSerializer(serializers.ModelSerializer):
         fields = ("id", "image")
 
 
-class PerformanceSerializer(serializers.ModelSerializer):
+class PerformanceSerializer(
+    SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
     class Meta:
         model = Performance
         fields = ("id", "show_time", "play", "theatre_hall")
@@ -87,6 +113,25 @@ class PerformanceListSerializer(PerformanceSerializer):
         source="theatre_hall.capacity", read_only=True
     )
     tickets_available = serializers.IntegerField(read_only=True)
+    select_related_fields = {
+        "play_title": ("play",),
+        "play_image": ("play",),
+        "theatre_hall_name": ("theatre_hall",),
+        "theatre_hall_capacity": ("theatre_hall",),
+        "tickets_available": ("theatre_hall",),
+    }
+    expandable_fields = {
+        "play": Expansion(
+            PlayListSerializer,
+            select_related=("play",),
+            prefetch_related=("play__genres", "play__actors"),
+            # genre and actor changes only touch the plays
+            last_modified=("play__updated_at",),
+        ),
+        "theatre_hall": Expansion(
+            TheatreHallSerializer, select_related=("theatre_hall",)
+        ),
+    }
 
     class Meta:
         model = Performance
@@ -101,13 +146,45 @@ class PerformanceListSerializer(PerformanceSerializer):
         )
 
 
+class PerformanceSummarySerializer(
+    SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
+    """Same shape as PerformanceListSerializer, read from the summary"""
+
+    id = serializers.IntegerField(source="pk", read_only=True)
+    tickets_available = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = PerformanceSummary
+        fields = PerformanceListSerializer.Meta.fields
+
+
+class PerformanceRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key field which loads every Performance with its hall
+    only once per serialization, however many tickets refer to it
+    """
+
+    def to_internal_value(self, data):
+        performances = self.context.setdefault("performances", {})
+
+        if str(data) not in performances:
+            performances[str(data)] = super().to_internal_value(data)
+
+        return performances[str(data)]
+
+
 class TicketSerializer(serializers.ModelSerializer):
+    performance = PerformanceRelatedField(
+        queryset=Performance.objects.select_related("theatre_hall")
+    )
+
     def validate(self, attrs):
         data = super(TicketSerializer, self).validate(attrs=attrs)
         Ticket.validate_ticket(
             attrs["row"],
             attrs["seat"],
-            attrs["performance"].cinema_hall,
+            attrs["performance"].theatre_hall,
             ValidationError
         )
         return data
@@ -115,6 +192,9 @@ class TicketSerializer(serializers.ModelSerializer):
     class Meta:
         model = Ticket
         fields = ("id", "row", "seat", "performance")
+        # seats uniqueness is checked for all tickets of a reservation
+        # at once in ReservationSerializer.validate
+        validators = []
 
 
 class TicketListSerializer(TicketSerializer):
@@ -137,6 +217,19 @@ class PerformanceDetailSerializer(PerformanceSerializer):
     taken_place = TicketSeatsSerializer(
         source="tickets", many=True, read_only=True
     )
+    select_related_fields = {
+        "play_image": ("play",),
+        "theatre_hall": ("theatre_hall",),
+    }
+    expandable_fields = {
+        "play": Expansion(
+            PlayListSerializer,
+            select_related=("play",),
+            prefetch_related=("play__genres", "play__actors"),
+            # genre and actor changes only touch the plays
+            last_modified=("play__updated_at",),
+        ),
+    }
 
     class Meta:
         model = Performance
@@ -150,21 +243,125 @@ class PerformanceDetailSerializer(PerformanceSerializer):
         )
 
 
+class SeatSerializer(serializers.Serializer):
+    row = serializers.IntegerField()
+    seat = serializers.IntegerField()
+
+
+class SeatHoldSerializer(serializers.Serializer):
+    seats = SeatSerializer(many=True, allow_empty=False)
+    minutes = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.SEAT_HOLD_MINUTES,
+        default=settings.SEAT_HOLD_MINUTES,
+        write_only=True,
+    )
+    expires_at = serializers.DateTimeField(read_only=True)
+
+    def validate_seats(self, seats):
+        theatre_hall = self.context["performance"].theatre_hall
+        for seat in seats:
+            Ticket.validate_ticket(
+                seat["row"], seat["seat"], theatre_hall, ValidationError
+            )
+        return seats
+
+    def create(self, validated_data):
+        holds = hold_seats(
+            self.context["performance"],
+            self.context["request"].user,
+            [(seat["row"], seat["seat"]) for seat in validated_data["seats"]],
+            validated_data["minutes"],
+        )
+        return {"seats": holds, "expires_at": holds[0].expires_at}
+
+
+class SeatAllocationSerializer(serializers.Serializer):
+    count = serializers.IntegerField(min_value=1)
+    reserve = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        validate_not_archived([self.context["performance"]], "performance")
+        return attrs
+
+    def validate_count(self, count):
+        seats_in_row = self.context["performance"].theatre_hall.seats_in_row
+        if count > seats_in_row:
+            raise ValidationError(
+                f"count must be in available range: "
+                f"(1, seats_in_row): (1, {seats_in_row})"
+            )
+        return count
+
+
 class ReservationSerializer(serializers.ModelSerializer):
-    tickets = TicketSerializer(many=True, read_only=False, allow_empty=False)
+    tickets = TicketSerializer(
+        many=True, read_only=False, allow_empty=False, required=False
+    )
+    hold = PerformanceRelatedField(
+        queryset=Performance.objects.select_related("theatre_hall"),
+        write_only=True,
+        required=False,
+        help_text="Book the seats held for this performance",
+    )
 
     class Meta:
         model = Reservation
-        fields = ("id", "tickets", "created_at")
+        fields = ("id", "tickets", "hold", "created_at")
+
+    def validate(self, attrs):
+        data = super(ReservationSerializer, self).validate(attrs=attrs)
+        user = self.context["request"].user
+        performance = data.pop("hold", None)
+
+        if "tickets" not in data and performance is not None:
+            data["tickets"] = [
+                {
+                    "performance": performance,
+                    "row": hold.row,
+                    "seat": hold.seat,
+                }
+                for hold in active_holds(performance, user)
+            ]
+            if not data["tickets"]:
+                raise ValidationError(
+                    {"hold": "There are no seats held for this performance."}
+                )
+
+        if "tickets" not in data:
+            raise ValidationError(
+                {"tickets": self.fields["tickets"].error_messages["required"]}
+            )
+
+        validate_seats_available(data["tickets"], user)
+        return data
 
     def create(self, validated_data):
-        with transaction.atomic():
-            tickets_data = validated_data.pop("tickets")
-            reservation = Reservation.objects.create(**validated_data)
-            for ticket_data in tickets_data:
-                Ticket.objects.create(order=reservation, **ticket_data)
-            return reservation
+        tickets_data = validated_data.pop("tickets")
+        return create_reservation(tickets_data, **validated_data)
+
+    def enqueue(self, **kwargs) -> ReservationRequest:
+        """Queue the validated reservation instead of creating it"""
+        return enqueue_reservation(self.validated_data["tickets"], **kwargs)
+
+
+class ReservationListSerializer(
+    SparseFieldsSerializerMixin, ReservationSerializer
+):
+    tickets = TicketListSerializer(
+        source="history", many=True, read_only=True
+    )
+    prefetch_related_fields = {"tickets": ("tickets", "archived_tickets")}
 
 
-class ReservationListSerializer(ReservationSerializer):
-    tickets = TicketListSerializer(many=True, read_only=True)
+class ReservationRequestSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ReservationRequest
+        fields = (
+            "id",
+            "status",
+            "reservation",
+            "errors",
+            "created_at",
+            "processed_at",
+        )
@@ -0,0 +1,161 @@
+from collections import Counter
+
+from django.db.models import F
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from performance.cache import bump_version
+from performance.models import (
+    Actor,
+    Genre,
+    Performance,
+    Play,
+    TheatreHall,
+    Ticket,
+)
+from performance.search import search_enabled, update_search_vectors
+from performance.summaries import (
+    add_seats_sold,
+    refresh_play_summaries,
+    refresh_summaries,
+    refresh_theatre_hall_summaries,
+)
+
+
+def touch(queryset) -> None:
+    """Mark rows as modified for conditional GET (see ConditionalListMixin)"""
+    queryset.update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Actor)
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Play)
+@receiver(post_save, sender=TheatreHall)
+@receiver(post_delete, sender=Actor)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Play)
+@receiver(post_delete, sender=TheatreHall)
+def invalidate_list_cache(sender, **kwargs):
+    bump_version(sender)
+
+
+@receiver(m2m_changed, sender=Play.genres.through)
+@receiver(m2m_changed, sender=Play.actors.through)
+def invalidate_play_cache(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_version(Play)
+
+
+@receiver(post_save, sender=Actor)
+@receiver(post_save, sender=Genre)
+@receiver(pre_delete, sender=Actor)
+@receiver(pre_delete, sender=Genre)
+def touch_plays(sender, instance, **kwargs):
+    """Plays list genre names and actor full names"""
+    touch(instance.plays.all())
+
+
+@receiver(m2m_changed, sender=Play.genres.through)
+@receiver(m2m_changed, sender=Play.actors.through)
+def touch_plays_on_relation_change(sender, instance, action, reverse,
+                                   pk_set, **kwargs):
+    if not reverse and action in ("post_add", "post_remove", "post_clear"):
+        touch(Play.objects.filter(pk=instance.pk))
+    elif reverse and action in ("post_add", "post_remove"):
+        touch(Play.objects.filter(pk__in=pk_set))
+    elif reverse and action == "pre_clear":
+        touch(instance.plays.all())
+
+
+@receiver(post_save, sender=Play)
+@receiver(post_save, sender=TheatreHall)
+def touch_performances(sender, instance, **kwargs):
+    """Performances list the play title and image, the hall and capacity"""
+    touch(instance.performances.all())
+
+
+@receiver(post_save, sender=Play)
+def update_play_search_vector(sender, instance, **kwargs):
+    update_search_vectors(Play.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Actor)
+@receiver(post_save, sender=Genre)
+def update_search_vectors_on_rename(sender, instance, **kwargs):
+    """Search vectors of plays hold actor and genre names"""
+    update_search_vectors(instance.plays.all())
+
+
+@receiver(pre_delete, sender=Actor)
+@receiver(pre_delete, sender=Genre)
+def remember_searchable_plays(sender, instance, **kwargs):
+    # the relations are gone by post_delete
+    if search_enabled():
+        instance.searchable_play_ids = list(
+            instance.plays.values_list("pk", flat=True)
+        )
+
+
+@receiver(post_delete, sender=Actor)
+@receiver(post_delete, sender=Genre)
+def update_search_vectors_on_delete(sender, instance, **kwargs):
+    if search_enabled():
+        update_search_vectors(
+            Play.objects.filter(pk__in=instance.searchable_play_ids)
+        )
+
+
+@receiver(m2m_changed, sender=Play.genres.through)
+@receiver(m2m_changed, sender=Play.actors.through)
+def update_search_vectors_on_relation_change(sender, instance, action,
+                                             reverse, pk_set, **kwargs):
+    if not search_enabled():
+        return
+
+    if not reverse and action in ("post_add", "post_remove", "post_clear"):
+        update_search_vectors(Play.objects.filter(pk=instance.pk))
+    elif reverse and action in ("post_add", "post_remove"):
+        update_search_vectors(Play.objects.filter(pk__in=pk_set))
+    elif reverse and action == "pre_clear":
+        instance.searchable_play_ids = list(
+            instance.plays.values_list("pk", flat=True)
+        )
+    elif reverse and action == "post_clear":
+        update_search_vectors(
+            Play.objects.filter(pk__in=instance.searchable_play_ids)
+        )
+
+
+@receiver(post_save, sender=Performance)
+def refresh_performance_summary(sender, instance, **kwargs):
+    refresh_summaries(Performance.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Play)
+def refresh_summaries_of_play(sender, instance, **kwargs):
+    refresh_play_summaries(instance)
+
+
+@receiver(post_save, sender=TheatreHall)
+def refresh_summaries_of_theatre_hall(sender, instance, **kwargs):
+    refresh_theatre_hall_summaries(instance)
+
+
+@receiver(post_delete, sender=Ticket)
+def release_sold_seat(sender, instance, **kwargs):
+    """
+    Deleted tickets (admin, or cascading from a reservation or its
+    user) are no longer sold; archived performances keep their count,
+    their tickets are deleted when moved to ArchivedTicket
+    """
+    released = Performance.objects.filter(
+        pk=instance.performance_id, archived=False, seats_sold__gt=0
+    ).update(seats_sold=F("seats_sold") - 1, updated_at=timezone.now())
+    if released:
+        add_seats_sold(Counter({instance.performance_id: -1}))
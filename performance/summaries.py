@@ -0,0 +1,79 @@
+from collections import Counter
+
+from django.db.models import F
+from django.utils import timezone
+
+from performance.models import Performance, PerformanceSummary
+
+
+SUMMARY_FIELDS = (
+    "show_time",
+    "play",
+    "play_title",
+    "play_image",
+    "theatre_hall",
+    "theatre_hall_name",
+    "theatre_hall_capacity",
+    "seats_sold",
+    "updated_at",
+)
+
+
+def summarize(performance: Performance) -> PerformanceSummary:
+    """Summary row of a performance with its play and hall fetched"""
+    return PerformanceSummary(
+        performance=performance,
+        show_time=performance.show_time,
+        play=performance.play,
+        play_title=performance.play.title,
+        play_image=performance.play.image.name,
+        theatre_hall=performance.theatre_hall,
+        theatre_hall_name=performance.theatre_hall.name,
+        theatre_hall_capacity=performance.theatre_hall.capacity,
+        seats_sold=performance.seats_sold,
+    )
+
+
+def refresh_summaries(performances, batch_size: int = 1000) -> int:
+    """Insert or overwrite the summaries of the performances queryset"""
+    summaries = [
+        summarize(performance)
+        for performance in performances.select_related(
+            "play", "theatre_hall"
+        )
+    ]
+
+    PerformanceSummary.objects.bulk_create(
+        summaries,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=["performance"],
+        update_fields=SUMMARY_FIELDS,
+    )
+    return len(summaries)
+
+
+def refresh_play_summaries(play) -> None:
+    """Copy the title and image of a renamed play into its summaries"""
+    PerformanceSummary.objects.filter(play=play).update(
+        play_title=play.title,
+        play_image=play.image.name,
+        updated_at=timezone.now(),
+    )
+
+
+def refresh_theatre_hall_summaries(theatre_hall) -> None:
+    """Copy the name and capacity of a changed hall into its summaries"""
+    PerformanceSummary.objects.filter(theatre_hall=theatre_hall).update(
+        theatre_hall_name=theatre_hall.name,
+        theatre_hall_capacity=theatre_hall.capacity,
+        updated_at=timezone.now(),
+    )
+
+
+def add_seats_sold(sold: Counter) -> None:
+    """Count tickets sold per performance id in the summaries as well"""
+    for performance_id, count in sorted(sold.items()):
+        PerformanceSummary.objects.filter(pk=performance_id).update(
+            seats_sold=F("seats_sold") + count, updated_at=timezone.now()
+        )
@@ -0,0 +1,44 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from performance.views import PlayViewSet
+
+
+class QueryBudgetMixin:
+    """
+    Assertions against N+1 queries for TestCase classes with an
+    authenticated self.client
+    """
+
+    def assertQueryBudget(self, url: str, budget: int, seed,
+                          sizes=(1, 5, 20), params=None):
+        """
+        Call seed(size) to add rows, then GET url, for every size.
+
+        Fails when a request runs more than budget queries or when the
+        number of queries changes with the number of rows listed.
+        """
+        counts = {}
+
+        for size in sizes:
+            seed(size)
+            cache.clear()
+            PlayViewSet.rendered_cache.clear()
+
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, params)
+
+            self.assertEqual(response.status_code, 200, url)
+            counts[size] = len(queries)
+
+        self.assertLessEqual(
+            max(counts.values()),
+            budget,
+            f"{url} exceeds its budget of {budget} queries: {counts}",
+        )
+        self.assertEqual(
+            len(set(counts.values())),
+            1,
+            f"{url} queries grow with the number of rows: {counts}",
+        )
@@ -0,0 +1,243 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db.utils import OperationalError
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+
+from performance.models import (
+    Play,
+    Performance,
+    TheatreHall,
+    Reservation,
+    Ticket,
+    ArchivedTicket,
+)
+from performance.reservations import create_reservation
+
+
+def sample_performance(**params) -> Performance:
+    defaults = {
+        "play": Play.objects.create(
+            title="Hamlet",
+            description="To be, or not to be",
+        ),
+        "theatre_hall": TheatreHall.objects.create(
+            name="Blue", rows=10, seats_in_row=10
+        ),
+    }
+    defaults.update(params)
+
+    return Performance.objects.create(**defaults)
+
+
+class ReconcileSeatsSoldTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            "hans@zimmer.com",
+            "inception",
+        )
+        self.performance = sample_performance()
+        reservation = Reservation.objects.create(user=self.user)
+        for seat in range(1, 4):
+            Ticket.objects.create(
+                performance=self.performance,
+                reservation=reservation,
+                row=1,
+                seat=seat,
+            )
+
+    def test_reconcile_drifted_counter(self):
+        out = StringIO()
+
+        call_command("reconcile_seats_sold", stdout=out)
+
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.seats_sold, 3)
+        self.assertIn("1 performance(s) reconciled", out.getvalue())
+
+    def test_reconcile_dry_run(self):
+        out = StringIO()
+
+        call_command("reconcile_seats_sold", "--dry-run", stdout=out)
+
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.seats_sold, 0)
+        self.assertIn("seats_sold 0 -> 3", out.getvalue())
+
+
+class ArchivePerformancesTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            "hans@zimmer.com",
+            "inception",
+        )
+        self.past = sample_performance()
+        self.upcoming = sample_performance()
+        self.reservation = Reservation.objects.create(user=self.user)
+        # show_time is auto_now_add, so it is moved with update()
+        for performance, days in ((self.past, -30), (self.upcoming, 30)):
+            Performance.objects.filter(pk=performance.pk).update(
+                show_time=timezone.now() + timedelta(days=days)
+            )
+            for seat in range(1, 4):
+                Ticket.objects.create(
+                    performance=performance,
+                    reservation=self.reservation,
+                    row=1,
+                    seat=seat,
+                )
+            Performance.objects.filter(pk=performance.pk).update(seats_sold=3)
+
+    def archive(self, *args) -> str:
+        out = StringIO()
+        before = timezone.localdate().isoformat()
+        call_command(
+            "archive_performances", "--before", before, *args, stdout=out
+        )
+        return out.getvalue()
+
+    def test_finished_tickets_archived_in_batches(self):
+        past_ids = set(self.past.tickets.values_list("id", flat=True))
+
+        out = self.archive("--batch-size", "2")
+
+        self.assertEqual(
+            set(ArchivedTicket.objects.values_list("id", flat=True)), past_ids
+        )
+        self.assertFalse(self.past.tickets.exists())
+        self.assertEqual(self.upcoming.tickets.count(), 3)
+        self.assertIn("2 ticket(s) archived", out)
+        self.assertIn("3 ticket(s) of performances before", out)
+
+    def test_dry_run(self):
+        out = self.archive("--dry-run")
+
+        self.assertIn("3 ticket(s) to archive", out)
+        self.assertFalse(ArchivedTicket.objects.exists())
+
+    def test_future_date_refused(self):
+        with self.assertRaises(CommandError):
+            call_command(
+                "archive_performances",
+                "--before",
+                (timezone.localdate() + timedelta(days=2)).isoformat(),
+                stdout=StringIO(),
+            )
+
+    def test_reservation_history_keeps_archived_tickets(self):
+        self.archive()
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        result = client.get(reverse("performance:reservation-list"))
+
+        tickets = result.data["results"][0]["tickets"]
+        self.assertEqual(len(tickets), 6)
+        self.assertEqual(
+            {ticket["performance"]["id"] for ticket in tickets},
+            {self.past.id, self.upcoming.id},
+        )
+
+    def test_reconcile_counts_archived_tickets(self):
+        self.archive()
+        out = StringIO()
+
+        call_command("reconcile_seats_sold", stdout=out)
+
+        self.past.refresh_from_db()
+        self.assertEqual(self.past.seats_sold, 3)
+        self.assertIn("0 performance(s) reconciled", out.getvalue())
+
+    def test_archived_seats_not_sold_again(self):
+        self.archive()
+        client = APIClient()
+        client.force_authenticate(self.user)
+        url = reverse("performance:performance-detail", args=[self.past.id])
+
+        results = [
+            client.post(
+                reverse("performance:reservation-list"),
+                {
+                    "tickets": [
+                        {"performance": self.past.id, "row": 1, "seat": 1}
+                    ]
+                },
+                format="json",
+            ),
+            client.post(f"{url}hold/", {"seats": [{"row": 1, "seat": 1}]}),
+            client.post(f"{url}allocate/?count=2&reserve=true"),
+        ]
+
+        for result in results:
+            self.assertEqual(result.status_code, 400)
+        self.assertFalse(self.past.tickets.exists())
+
+    def test_reservation_refused_once_archived(self):
+        self.archive()
+
+        # validated before the performance was archived
+        with self.assertRaises(ValidationError):
+            create_reservation(
+                [{"performance": self.past, "row": 1, "seat": 1}],
+                user=self.user,
+            )
+
+        self.assertFalse(self.past.tickets.exists())
+        self.past.refresh_from_db()
+        self.assertEqual(self.past.seats_sold, 3)
+
+
+class BenchmarkReservationsTest(TestCase):
+    def test_refuses_remote_database(self):
+        with mock.patch(
+            "performance.management.commands.benchmark_reservations"
+            ".connection"
+        ) as connection:
+            connection.settings_dict = {"HOST": "db.example.com"}
+
+            with self.assertRaisesMessage(CommandError, "--force"):
+                call_command("benchmark_reservations", stdout=StringIO())
+
+        self.assertFalse(Play.objects.exists())
+
+
+@mock.patch("performance.management.commands.wait_for_db.time.sleep")
+class WaitForDbTest(TestCase):
+    def test_retries_with_backoff(self, sleep):
+        with mock.patch(
+            "performance.management.commands.wait_for_db.connection"
+        ) as connection:
+            connection.ensure_connection.side_effect = [
+                OperationalError("connection refused"),
+                OperationalError("connection refused"),
+                OperationalError("connection refused"),
+                None,
+            ]
+            out = StringIO()
+
+            call_command("wait_for_db", stdout=out)
+
+        self.assertEqual(connection.ensure_connection.call_count, 4)
+        self.assertEqual(
+            [call.args[0] for call in sleep.call_args_list], [0.1, 0.2, 0.4]
+        )
+        self.assertIn("Database ready", out.getvalue())
+
+    def test_gives_up_after_timeout(self, sleep):
+        with mock.patch(
+            "performance.management.commands.wait_for_db.connection"
+        ) as connection:
+            connection.ensure_connection.side_effect = OperationalError(
+                "connection refused"
+            )
+
+            with self.assertRaises(CommandError):
+                call_command("wait_for_db", timeout=0, stdout=StringIO())
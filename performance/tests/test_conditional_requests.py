@@ -0,0 +1,129 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.http import http_date
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from performance.models import Actor, Genre, Performance, Play, TheatreHall
+
+
+PLAY_URL = reverse("performance:play-list")
+PERFORMANCE_URL = reverse("performance:performance-list")
+
+
+class ConditionalListTest(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "hans@zimmer.com",
+            "inception",
+        )
+        self.play = Play.objects.create(
+            title="Hamlet", description="To be, or not to be"
+        )
+        self.theatre_hall = TheatreHall.objects.create(
+            name="Blue", rows=10, seats_in_row=10
+        )
+        self.performance = Performance.objects.create(
+            play=self.play, theatre_hall=self.theatre_hall
+        )
+
+        self.client.force_authenticate(self.user)
+
+    def assertNotModified(self, url, etag, **params) -> None:
+        result = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(result.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(result.content, b"")
+
+    def assertModified(self, url, etag, **params) -> None:
+        result = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(result.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(result["ETag"], etag)
+
+    def test_unchanged_list_not_modified(self):
+        for url in (PLAY_URL, PERFORMANCE_URL):
+            result = self.client.get(url)
+
+            self.assertEqual(result.status_code, status.HTTP_200_OK)
+            self.assertNotIn("Last-Modified", result)
+            self.assertNotModified(url, result["ETag"])
+
+    def test_not_modified_costs_one_query(self):
+        etag = self.client.get(PERFORMANCE_URL)["ETag"]
+
+        with self.assertNumQueries(1):
+            self.assertNotModified(PERFORMANCE_URL, etag)
+
+    def test_if_modified_since_ignored(self):
+        other = Performance.objects.create(
+            play=self.play, theatre_hall=self.theatre_hall
+        )
+        other.delete()
+
+        result = self.client.get(
+            PERFORMANCE_URL,
+            HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 60),
+        )
+
+        self.assertEqual(result.status_code, status.HTTP_200_OK)
+
+    def test_etag_depends_on_filters(self):
+        etag = self.client.get(PLAY_URL)["ETag"]
+
+        self.assertModified(PLAY_URL, etag, title="ham")
+
+    def test_play_change_modifies_both_lists(self):
+        play_etag = self.client.get(PLAY_URL)["ETag"]
+        performance_etag = self.client.get(PERFORMANCE_URL)["ETag"]
+
+        self.play.title = "Macbeth"
+        self.play.save()
+
+        self.assertModified(PLAY_URL, play_etag)
+        self.assertModified(PERFORMANCE_URL, performance_etag)
+
+    def test_genre_and_actor_changes_modify_plays(self):
+        genre = Genre.objects.create(name="Drama")
+        actor = Actor.objects.create(first_name="Charlie", last_name="Chaplin")
+
+        etag = self.client.get(PLAY_URL)["ETag"]
+        self.play.genres.add(genre)
+        self.assertModified(PLAY_URL, etag)
+
+        etag = self.client.get(PLAY_URL)["ETag"]
+        actor.plays.add(self.play)
+        self.assertModified(PLAY_URL, etag)
+
+        etag = self.client.get(PLAY_URL)["ETag"]
+        genre.name = "Tragedy"
+        genre.save()
+        self.assertModified(PLAY_URL, etag)
+
+    def test_sold_tickets_modify_performances(self):
+        etag = self.client.get(PERFORMANCE_URL)["ETag"]
+
+        self.client.post(
+            reverse("performance:reservation-list"),
+            {
+                "tickets": [
+                    {"performance": self.performance.id, "row": 1, "seat": 1}
+                ]
+            },
+            format="json",
+        )
+
+        self.assertModified(PERFORMANCE_URL, etag)
+
+    def test_deleted_performance_modifies_list(self):
+        other = Performance.objects.create(
+            play=self.play, theatre_hall=self.theatre_hall
+        )
+        etag = self.client.get(PERFORMANCE_URL)["ETag"]
+
+        other.delete()
+
+        self.assertModified(PERFORMANCE_URL, etag)
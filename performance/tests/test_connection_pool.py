@@ -0,0 +1,54 @@
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase
+from psycopg2 import extensions
+
+from config.db_pool.base import CountingConnectionPool, PoolTimeout
+
+
+def fake_connection(*args, **kwargs):
+    return mock.Mock(
+        closed=0,
+        info=mock.Mock(
+            transaction_status=extensions.TRANSACTION_STATUS_IDLE
+        ),
+    )
+
+
+@mock.patch("psycopg2.pool.psycopg2.connect", side_effect=fake_connection)
+class ConnectionPoolTest(SimpleTestCase):
+    def test_returned_connections_reused(self, connect):
+        pool = CountingConnectionPool(2, 0.1)
+
+        connection = pool.getconn()
+        pool.putconn(connection)
+
+        self.assertIs(pool.getconn(), connection)
+        self.assertEqual(connect.call_count, 1)
+
+    def test_exhausted_pool_times_out(self, connect):
+        pool = CountingConnectionPool(2, 0.1)
+        pool.getconn()
+        pool.getconn()
+
+        with self.assertRaises(PoolTimeout):
+            pool.getconn()
+
+    def test_exhausted_pool_waits_for_returned_connection(self, connect):
+        pool = CountingConnectionPool(1, 5)
+        connection = pool.getconn()
+        borrowed = []
+
+        waiting = threading.Thread(
+            target=lambda: borrowed.append(pool.getconn())
+        )
+        waiting.start()
+        waiting.join(0.1)
+        self.assertEqual(borrowed, [])
+
+        pool.putconn(connection)
+        waiting.join()
+
+        self.assertEqual(borrowed, [connection])
+        self.assertEqual(connect.call_count, 1)
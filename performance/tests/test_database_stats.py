@@ -0,0 +1,42 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from config.db_metrics import stats
+
+
+DATABASE_STATS_URL = reverse("database-stats")
+
+
+class DatabaseStatsTest(TestCase):
+    databases = "__all__"
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "hans@zimmer.com",
+            "inception",
+        )
+
+    def test_admin_required(self):
+        self.client.force_authenticate(self.user)
+
+        result = self.client.get(DATABASE_STATS_URL)
+
+        self.assertEqual(result.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_connection_churn_reported(self):
+        self.user.is_staff = True
+        self.client.force_authenticate(self.user)
+        requests = stats["requests"]
+
+        self.client.get(DATABASE_STATS_URL)
+        result = self.client.get(DATABASE_STATS_URL)
+
+        self.assertEqual(result.status_code, status.HTTP_200_OK)
+        self.assertEqual(result.data["requests"], requests + 1)
+        self.assertIn("default", result.data["ping_ms"])
+        self.assertIn("connections_opened_per_request", result.data)
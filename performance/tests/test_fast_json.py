@@ -0,0 +1,136 @@
+import io
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from config import fast_json
+from config.fast_json import FastJSONParser, FastJSONRenderer
+from performance.models import Play
+
+
+SAMPLE = ReturnDict(
+    {
+        "aware": datetime(
+            2026, 10, 18, 19, 30, 5, 123456, tzinfo=timezone.utc
+        ),
+        "offset": datetime(
+            2026, 10, 18, 19, 30, tzinfo=timezone(timedelta(hours=3))
+        ),
+        "naive": datetime(2026, 10, 18, 19, 30),
+        "date": date(2026, 10, 18),
+        "time": time(19, 30, 0, 500),
+        "duration": timedelta(hours=2, minutes=30),
+        "price": Decimal("12.50"),
+        "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        "lazy": gettext_lazy("Hamlet"),
+        "bytes": b"seat map",
+        "text": "Žluťoučký kůň\u2028line\u2029paragraph",
+        "nested": [{"row": 1, "seat": (2, 3)}, None, True, 1.5],
+        "big": 2 ** 70,
+    },
+    serializer=None,
+)
+
+
+class FastJSONRendererTest(SimpleTestCase):
+    def assertSameRendering(self, data, *args) -> None:
+        self.assertEqual(
+            FastJSONRenderer().render(data, *args),
+            JSONRenderer().render(data, *args),
+        )
+
+    def test_same_bytes_as_json_renderer(self):
+        self.assertSameRendering(SAMPLE)
+
+    def test_without_big_integers(self):
+        # 2 ** 70 is rendered by the stdlib fallback, check orjson alone
+        data = {key: value for key, value in SAMPLE.items() if key != "big"}
+
+        with mock.patch.object(
+            JSONRenderer, "render", side_effect=AssertionError
+        ):
+            fast = FastJSONRenderer().render(data)
+
+        self.assertEqual(fast, JSONRenderer().render(data))
+
+    def test_indent(self):
+        self.assertSameRendering(SAMPLE, "application/json; indent=4")
+
+    def test_none(self):
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+    def test_without_orjson(self):
+        with mock.patch.object(fast_json, "orjson", None):
+            self.assertSameRendering(SAMPLE)
+
+
+class FastJSONParserTest(SimpleTestCase):
+    def parse(self, content: bytes, parser_class=FastJSONParser):
+        return parser_class().parse(io.BytesIO(content))
+
+    def test_same_data_as_json_parser(self):
+        content = JSONRenderer().render(
+            {key: value for key, value in SAMPLE.items() if key != "big"}
+        )
+
+        self.assertEqual(self.parse(content), self.parse(content, JSONParser))
+
+    def test_invalid_json(self):
+        for content in (b"", b"{", b'{"seat": NaN}', b"\xff"):
+            with self.subTest(content=content):
+                with self.assertRaises(ParseError):
+                    self.parse(content)
+
+    def test_without_orjson(self):
+        with mock.patch.object(fast_json, "orjson", None):
+            self.assertEqual(self.parse(b'{"row": 1}'), {"row": 1})
+
+
+class FastJSONSettingsTest(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                "hans@zimmer.com",
+                "inception",
+            )
+        )
+        self.play = Play.objects.create(
+            title="Hamlet", description="To be, or not to be"
+        )
+        Play.objects.filter(pk=self.play.pk).update(
+            image="uploads/plays/hamlet.jpg"
+        )
+
+    def test_api_renders_and_parses_with_fast_json(self):
+        result = self.client.get(
+            reverse("performance:play-detail", args=[self.play.id])
+        )
+
+        self.assertIsInstance(result.accepted_renderer, FastJSONRenderer)
+        self.assertEqual(result.content, JSONRenderer().render(result.data))
+        self.assertEqual(
+            result.json()["image"],
+            "http://testserver/media/uploads/plays/hamlet.jpg",
+        )
+
+        result = self.client.post(
+            reverse("performance:reservation-list"),
+            "{",
+            content_type="application/json",
+        )
+
+        self.assertEqual(result.status_code, 400)
+        self.assertIn("JSON parse error", result.data["detail"])
@@ -0,0 +1,145 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from performance.models import (
+    Actor,
+    Genre,
+    Performance,
+    Play,
+    Reservation,
+    TheatreHall,
+    Ticket,
+)
+from performance.views import PlayViewSet
+
+
+ACTOR_URL = reverse("performance:actor-list")
+PLAY_URL = reverse("performance:play-list")
+PERFORMANCE_URL = reverse("performance:performance-list")
+
+
+class FastSerializerParityTest(TestCase):
+    """Lists built from .values() rows are byte-identical to DRF ones"""
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "hans@zimmer.com",
+            "inception",
+        )
+        genres = [
+            Genre.objects.create(name=name)
+            for name in ("Drama", "Comedy", "Tragedy")
+        ]
+        actors = [
+            Actor.objects.create(first_name=first_name, last_name=last_name)
+            for first_name, last_name in (
+                ("Meryl", "Streep"),
+                ("Charlie", "Chaplin"),
+                ("Ália", "Šimková"),
+            )
+        ]
+        hamlet = Play.objects.create(
+            title="Hamlet", description="To be, or not to be"
+        )
+        hamlet.genres.add(genres[2], genres[0])
+        hamlet.actors.add(*actors)
+        macbeth = Play.objects.create(title="Macbeth", description="")
+        macbeth.genres.add(genres[1])
+        Play.objects.create(title="Cats", description="")
+        # a stored file name is enough to build the image url
+        Play.objects.filter(pk=hamlet.pk).update(
+            image="uploads/plays/hamlet.jpg"
+        )
+
+        big_hall = TheatreHall.objects.create(
+            name="Blue", rows=20, seats_in_row=15
+        )
+        small_hall = TheatreHall.objects.create(
+            name="Red", rows=5, seats_in_row=5
+        )
+        for play, theatre_hall in (
+            (hamlet, big_hall),
+            (macbeth, small_hall),
+            (hamlet, small_hall),
+        ):
+            Performance.objects.create(play=play, theatre_hall=theatre_hall)
+
+        performance = Performance.objects.first()
+        reservation = Reservation.objects.create(user=self.user)
+        for seat in range(1, 4):
+            Ticket.objects.create(
+                performance=performance,
+                reservation=reservation,
+                row=1,
+                seat=seat,
+            )
+        Performance.objects.filter(pk=performance.pk).update(seats_sold=3)
+
+        self.client.force_authenticate(self.user)
+
+    def get(self, url: str, fast: bool, **params):
+        cache.clear()
+        PlayViewSet.rendered_cache.clear()
+
+        with override_settings(FAST_LIST_SERIALIZERS=fast):
+            return self.client.get(url, params)
+
+    def assertParity(self, url: str, **params) -> None:
+        fast = self.get(url, True, **params)
+        regular = self.get(url, False, **params)
+
+        self.assertEqual(fast.status_code, status.HTTP_200_OK)
+        self.assertEqual(fast.content, regular.content)
+
+    def test_actor_list(self):
+        self.assertParity(ACTOR_URL)
+
+    def test_play_list(self):
+        self.assertParity(PLAY_URL)
+
+    def test_play_list_filtered(self):
+        self.assertParity(
+            PLAY_URL, genres=str(Genre.objects.get(name="Drama").id)
+        )
+
+    def test_play_list_pages(self):
+        first = self.get(PLAY_URL, True, page_size=2)
+        self.assertParity(PLAY_URL, page_size=2)
+
+        self.assertParity(first.json()["next"])
+
+    def test_play_search(self):
+        self.assertParity(PLAY_URL, search="hamlet")
+
+    def test_performance_list(self):
+        self.assertParity(PERFORMANCE_URL)
+
+    def test_performance_list_pages(self):
+        first = self.get(PERFORMANCE_URL, True, page_size=1)
+        self.assertParity(PERFORMANCE_URL, page_size=1, with_count="true")
+
+        self.assertParity(first.json()["next"])
+
+    def test_performance_list_filtered(self):
+        self.assertParity(
+            PERFORMANCE_URL, play=str(Play.objects.get(title="Hamlet").id)
+        )
+
+    def test_play_list_reads_page_and_name_maps(self):
+        # 304 check, the page, genre names and actor names
+        with self.assertNumQueries(4):
+            result = self.get(PLAY_URL, True)
+
+        self.assertEqual(
+            result.json()["results"][1]["genres"], ["Drama", "Tragedy"]
+        )
+        self.assertEqual(
+            result.json()["results"][1]["image"],
+            "http://testserver/media/uploads/plays/hamlet.jpg",
+        )
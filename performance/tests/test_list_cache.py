@@ -0,0 +1,115 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from config.checks import check_default_cache
+from performance.models import Actor, Genre, TheatreHall
+
+
+GENRE_URL = reverse("performance:genre-list")
+ACTOR_URL = reverse("performance:actor-list")
+THEATRE_HALL_URL = reverse("performance:theatrehall-list")
+
+
+class ReferenceListCacheTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "hans@zimmer.com",
+            "inception",
+        )
+        Genre.objects.create(name="Drama")
+        Actor.objects.create(first_name="Charlie", last_name="Chaplin")
+        TheatreHall.objects.create(name="Blue", rows=10, seats_in_row=10)
+
+        self.client.force_authenticate(self.user)
+
+    def test_cached_lists_cost_no_queries(self):
+        for url in (GENRE_URL, ACTOR_URL, THEATRE_HALL_URL):
+            first = self.client.get(url)
+
+            with self.assertNumQueries(0):
+                second = self.client.get(url)
+
+            self.assertEqual(second.status_code, status.HTTP_200_OK)
+            self.assertEqual(second.data, first.data)
+
+    def test_create_invalidates_list(self):
+        self.client.get(GENRE_URL)
+
+        Genre.objects.create(name="Comedy")
+        result = self.client.get(GENRE_URL)
+
+        self.assertEqual(
+            [genre["name"] for genre in result.data], ["Comedy", "Drama"]
+        )
+
+    def test_update_and_delete_invalidate_list(self):
+        self.client.get(ACTOR_URL)
+
+        actor = Actor.objects.get()
+        actor.last_name = "Spencer Chaplin"
+        actor.save()
+        self.assertEqual(
+            self.client.get(ACTOR_URL).data[0]["full_name"],
+            "Charlie Spencer Chaplin",
+        )
+
+        actor.delete()
+        self.assertEqual(self.client.get(ACTOR_URL).data, [])
+
+    def test_cache_not_shared_between_models(self):
+        self.client.get(GENRE_URL)
+
+        TheatreHall.objects.create(name="Red", rows=5, seats_in_row=5)
+
+        with self.assertNumQueries(0):
+            self.client.get(GENRE_URL)
+
+    def test_warm_cache(self):
+        call_command("warm_cache", stdout=StringIO())
+
+        with self.assertNumQueries(0):
+            result = self.client.get(THEATRE_HALL_URL)
+
+        self.assertEqual(result.data[0]["name"], "Blue")
+
+
+class DefaultCacheCheckTest(SimpleTestCase):
+    def check_ids(self, backend, debug) -> list:
+        with override_settings(
+            CACHES={"default": {"BACKEND": backend}}, DEBUG=debug
+        ):
+            return [message.id for message in check_default_cache(None)]
+
+    def test_process_local_cache_refused(self):
+        self.assertEqual(
+            self.check_ids(
+                "django.core.cache.backends.locmem.LocMemCache", False
+            ),
+            ["config.E001"],
+        )
+
+    def test_process_local_cache_allowed_in_debug(self):
+        self.assertEqual(
+            self.check_ids(
+                "django.core.cache.backends.locmem.LocMemCache", True
+            ),
+            [],
+        )
+
+    def test_shared_cache_passes(self):
+        self.assertEqual(
+            self.check_ids(
+                "django.core.cache.backends.redis.RedisCache", False
+            ),
+            [],
+        )
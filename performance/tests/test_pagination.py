@@ -0,0 +1,86 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from performance.models import Play, Reservation
+from performance.views import PlayViewSet
+
+
+PLAY_URL = reverse("performance:play-list")
+RESERVATION_URL = reverse("performance:reservation-list")
+
+
+class KeysetPaginationTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        PlayViewSet.rendered_cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "hans@zimmer.com",
+            "inception",
+        )
+        # equal titles are ordered by id
+        self.plays = Play.objects.bulk_create(
+            Play(title=f"Play {number // 2}", description="")
+            for number in range(12)
+        )
+
+        self.client.force_authenticate(self.user)
+
+    def walk(self, url: str, params: dict) -> list:
+        """Follow next links, return the queries of every page"""
+        pages = []
+
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                result = self.client.get(url, params)
+            self.assertEqual(result.status_code, status.HTTP_200_OK)
+            page = result.json()
+            pages.append((page["results"], len(queries)))
+            url, params = page["next"], {}
+
+        return pages
+
+    def test_pages_cover_all_rows_once_in_order(self):
+        pages = self.walk(PLAY_URL, {"page_size": 5})
+
+        self.assertEqual(len(pages), 3)
+        self.assertEqual(
+            [play["id"] for results, _ in pages for play in results],
+            [play.id for play in self.plays],
+        )
+
+    def test_deep_page_costs_as_much_as_first(self):
+        pages = self.walk(PLAY_URL, {"page_size": 2})
+
+        self.assertEqual(len({queries for _, queries in pages}), 1)
+
+    def test_count_on_request_only(self):
+        page = self.client.get(PLAY_URL, {"page_size": 5}).json()
+        self.assertNotIn("count", page)
+
+        page = self.client.get(
+            PLAY_URL, {"page_size": 5, "with_count": "true"}
+        ).json()
+        self.assertEqual(page["count"], 12)
+        self.assertEqual(len(page["results"]), 5)
+
+    def test_reservations_paginated_newest_first(self):
+        reservations = [
+            Reservation.objects.create(user=self.user) for _ in range(7)
+        ]
+
+        pages = self.walk(RESERVATION_URL, {})
+
+        self.assertEqual([len(results) for results, _ in pages], [5, 2])
+        self.assertEqual(
+            [reservation["id"] for results, _ in pages
+             for reservation in results],
+            [reservation.id for reservation in reversed(reservations)],
+        )
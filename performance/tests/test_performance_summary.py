@@ -0,0 +1,168 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from performance.models import (
+    Play,
+    Performance,
+    PerformanceSummary,
+    Reservation,
+    TheatreHall,
+)
+
+
+PERFORMANCE_URL = reverse("performance:performance-list")
+RESERVATION_URL = reverse("performance:reservation-list")
+
+
+def sample_performance(**params) -> Performance:
+    defaults = {
+        "play": Play.objects.create(
+            title="Hamlet",
+            description="To be, or not to be",
+        ),
+        "theatre_hall": TheatreHall.objects.create(
+            name="Blue", rows=10, seats_in_row=10
+        ),
+    }
+    defaults.update(params)
+
+    return Performance.objects.create(**defaults)
+
+
+class PerformanceSummaryTest(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "hans@zimmer.com",
+            "inception",
+        )
+        self.performance = sample_performance()
+
+        self.client.force_authenticate(self.user)
+
+    def test_summary_created_with_performance(self):
+        summary = PerformanceSummary.objects.get(pk=self.performance.id)
+
+        self.assertEqual(summary.show_time, self.performance.show_time)
+        self.assertEqual(summary.play_title, "Hamlet")
+        self.assertEqual(summary.theatre_hall_name, "Blue")
+        self.assertEqual(summary.theatre_hall_capacity, 100)
+        self.assertEqual(summary.tickets_available, 100)
+
+    def test_reservation_counted_in_summary(self):
+        self.client.post(
+            RESERVATION_URL,
+            {
+                "tickets": [
+                    {"performance": self.performance.id, "row": 1, "seat": 1},
+                    {"performance": self.performance.id, "row": 1, "seat": 2},
+                ]
+            },
+            format="json",
+        )
+
+        summary = PerformanceSummary.objects.get(pk=self.performance.id)
+        self.assertEqual(summary.seats_sold, 2)
+        self.assertEqual(summary.tickets_available, 98)
+
+    def test_deleted_reservation_releases_seats(self):
+        self.client.post(
+            RESERVATION_URL,
+            {
+                "tickets": [
+                    {"performance": self.performance.id, "row": 1, "seat": 1},
+                    {"performance": self.performance.id, "row": 1, "seat": 2},
+                ]
+            },
+            format="json",
+        )
+
+        Reservation.objects.get().delete()
+
+        self.performance.refresh_from_db()
+        summary = PerformanceSummary.objects.get(pk=self.performance.id)
+        self.assertEqual(self.performance.seats_sold, 0)
+        self.assertEqual(summary.seats_sold, 0)
+
+    def test_deleted_user_releases_seats(self):
+        self.client.post(
+            RESERVATION_URL,
+            {
+                "tickets": [
+                    {"performance": self.performance.id, "row": 1, "seat": 1}
+                ]
+            },
+            format="json",
+        )
+
+        self.user.delete()
+
+        self.performance.refresh_from_db()
+        summary = PerformanceSummary.objects.get(pk=self.performance.id)
+        self.assertEqual(self.performance.seats_sold, 0)
+        self.assertEqual(summary.tickets_available, 100)
+
+    def test_play_and_hall_changes_propagate(self):
+        self.performance.play.title = "Macbeth"
+        self.performance.play.save()
+        self.performance.theatre_hall.rows = 20
+        self.performance.theatre_hall.save()
+
+        summary = PerformanceSummary.objects.get(pk=self.performance.id)
+        self.assertEqual(summary.play_title, "Macbeth")
+        self.assertEqual(summary.theatre_hall_capacity, 200)
+
+    def test_summary_deleted_with_performance(self):
+        self.performance.delete()
+
+        self.assertFalse(PerformanceSummary.objects.exists())
+
+    def test_summary_list_matches_list(self):
+        sample_performance(play=self.performance.play)
+
+        result = self.client.get(PERFORMANCE_URL)
+        summary = self.client.get(PERFORMANCE_URL, {"summary": "true"})
+
+        self.assertEqual(summary.status_code, status.HTTP_200_OK)
+        self.assertEqual(summary.data["results"], result.data["results"])
+
+    def test_summary_list_filtered(self):
+        other = sample_performance()
+
+        result = self.client.get(
+            PERFORMANCE_URL, {"summary": "true", "play": other.play.id}
+        )
+
+        self.assertEqual(
+            [performance["id"] for performance in result.data["results"]],
+            [other.id],
+        )
+
+    def test_summary_list_reads_single_table(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(PERFORMANCE_URL, {"summary": "true"})
+
+        self.assertTrue(queries.captured_queries)
+        for query in queries.captured_queries:
+            self.assertIn("performance_performancesummary", query["sql"])
+            self.assertNotIn("JOIN", query["sql"])
+
+    def test_rebuild_command(self):
+        PerformanceSummary.objects.all().delete()
+        out = StringIO()
+
+        call_command("rebuild_performance_summaries", stdout=out)
+
+        self.assertEqual(
+            PerformanceSummary.objects.get().play_title, "Hamlet"
+        )
+        self.assertIn("1 performance summaries rebuilt", out.getvalue())
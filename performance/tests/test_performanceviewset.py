@@ -0,0 +1,478 @@
+import base64
+from datetime import datetime, timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from performance.models import (
+    Play,
+    Performance,
+    TheatreHall,
+    Reservation,
+    Ticket,
+    SeatHold,
+)
+
+
+PERFORMANCE_URL = reverse("performance:performance-list")
+
+
+def seat_map_url(performance_id: int):
+    return reverse("performance:performance-seat-map", args=[performance_id])
+
+
+def allocate_url(performance_id: int):
+    return reverse("performance:performance-allocate", args=[performance_id])
+
+
+def hold_url(performance_id: int):
+    return reverse("performance:performance-hold", args=[performance_id])
+
+
+def sample_performance(**params) -> Performance:
+    defaults = {
+        "play": Play.objects.create(
+            title="Hamlet",
+            description="To be, or not to be",
+        ),
+        "theatre_hall": TheatreHall.objects.create(
+            name="Blue", rows=3, seats_in_row=5
+        ),
+    }
+    defaults.update(params)
+
+    return Performance.objects.create(**defaults)
+
+
+def sample_ticket(performance: Performance, user, **params) -> Ticket:
+    defaults = {
+        "row": 1,
+        "seat": 1,
+    }
+    defaults.update(params)
+
+    return Ticket.objects.create(
+        performance=performance,
+        reservation=Reservation.objects.create(user=user),
+        **defaults,
+    )
+
+
+class PerformanceListTest(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "hans@zimmer.com",
+            "inception",
+        )
+        self.performance = sample_performance()
+
+        self.client.force_authenticate(self.user)
+
+    def test_tickets_available(self):
+        Performance.objects.filter(pk=self.performance.id).update(seats_sold=4)
+
+        result = self.client.get(PERFORMANCE_URL)
+
+        performance = result.data["results"][0]
+        self.assertEqual(result.status_code, status.HTTP_200_OK)
+        self.assertEqual(performance["theatre_hall_capacity"], 15)
+        self.assertEqual(performance["tickets_available"], 11)
+
+    def test_list_does_not_aggregate_tickets(self):
+        sample_ticket(self.performance, self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(PERFORMANCE_URL)
+
+        for query in queries:
+            self.assertNotIn("performance_ticket", query["sql"])
+            self.assertNotIn("GROUP BY", query["sql"])
+
+
+class PerformanceScheduleTest(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "hans@zimmer.com",
+            "inception",
+        )
+        self.performance = sample_performance()
+
+        self.client.force_authenticate(self.user)
+
+    def sample_show(self, day: int, hour: int, **params) -> Performance:
+        defaults = {
+            "play": self.performance.play,
+            "theatre_hall": self.performance.theatre_hall,
+        }
+        defaults.update(params)
+
+        performance = sample_performance(**defaults)
+        Performance.objects.filter(pk=performance.id).update(
+            show_time=timezone.make_aware(datetime(2023, 10, day, hour))
+        )
+        return performance
+
+    def listed_ids(self, **params) -> set:
+        result = self.client.get(PERFORMANCE_URL, params)
+        self.assertEqual(result.status_code, status.HTTP_200_OK)
+        return {performance["id"] for performance in result.data["results"]}
+
+    def test_filter_by_date_in_server_timezone(self):
+        late_show = self.sample_show(1, 23)
+        early_show = self.sample_show(2, 0)
+
+        self.assertEqual(self.listed_ids(date="2023-10-01"), {late_show.id})
+        self.assertEqual(self.listed_ids(date="2023-10-02"), {early_show.id})
+
+    def test_filter_by_date_range(self):
+        first = self.sample_show(1, 19)
+        second = self.sample_show(3, 19)
+        self.sample_show(4, 19)
+
+        self.assertEqual(
+            self.listed_ids(date_from="2023-10-01", date_to="2023-10-03"),
+            {first.id, second.id},
+        )
+
+    def test_filter_by_theatre_hall(self):
+        show = self.sample_show(1, 19)
+        other_hall = TheatreHall.objects.create(
+            name="Red", rows=3, seats_in_row=5
+        )
+        self.sample_show(1, 19, theatre_hall=other_hall)
+
+        self.assertEqual(
+            self.listed_ids(
+                date="2023-10-01",
+                theatre_hall=self.performance.theatre_hall.id,
+            ),
+            {show.id},
+        )
+
+    def test_malformed_filters_rejected(self):
+        for param, value in (
+            ("date", "2023-13-01"),
+            ("date_from", "yesterday"),
+            ("date_to", "2023/10/01"),
+            ("play", "x"),
+            ("theatre_hall", "1.5"),
+        ):
+            result = self.client.get(PERFORMANCE_URL, {param: value})
+
+            self.assertEqual(result.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn(param, result.data)
+
+    def assertUsesIndex(self, queryset, index_name: str):
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                # tiny test tables are cheaper to scan than to look up
+                cursor.execute("SET LOCAL enable_seqscan = off")
+
+        self.assertIn(index_name, queryset.explain())
+
+    def test_play_schedule_uses_index(self):
+        start = timezone.make_aware(datetime(2023, 10, 1))
+
+        self.assertUsesIndex(
+            Performance.objects.filter(
+                play=self.performance.play,
+                show_time__gte=start,
+                show_time__lt=start + timedelta(days=7),
+            ),
+            "performance_play_show_idx",
+        )
+
+    def test_theatre_hall_schedule_uses_index(self):
+        start = timezone.make_aware(datetime(2023, 10, 1))
+
+        self.assertUsesIndex(
+            Performance.objects.filter(
+                theatre_hall=self.performance.theatre_hall,
+                show_time__gte=start,
+                show_time__lt=start + timedelta(days=1),
+            ),
+            "performance_hall_show_idx",
+        )
+
+
+class PerformanceSeatMapTest(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "hans@zimmer.com",
+            "inception",
+        )
+        self.performance = sample_performance()
+
+        self.client.force_authenticate(self.user)
+
+    def test_seat_map_auth_required(self):
+        self.client.force_authenticate(None)
+
+        result = self.client.get(seat_map_url(self.performance.id))
+
+        self.assertEqual(result.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_seat_map_packs_taken_seats(self):
+        sample_ticket(self.performance, self.user, row=1, seat=1)
+        sample_ticket(self.performance, self.user, row=2, seat=4)
+        sample_ticket(self.performance, self.user, row=3, seat=5)
+
+        result = self.client.get(seat_map_url(self.performance.id))
+
+        self.assertEqual(result.status_code, status.HTTP_200_OK)
+        self.assertEqual(result.data["rows"], 3)
+        self.assertEqual(result.data["seats_in_row"], 5)
+        self.assertEqual(
+            base64.b64decode(result.data["taken_place"]),
+            bytes([0b10000000, 0b10000010]),
+        )
+
+    def test_seat_map_binary_encoding(self):
+        sample_ticket(self.performance, self.user, row=1, seat=3)
+
+        result = self.client.get(
+            seat_map_url(self.performance.id), {"encoding": "binary"}
+        )
+
+        self.assertEqual(result.status_code, status.HTTP_200_OK)
+        self.assertEqual(result["Content-Type"], "application/octet-stream")
+        self.assertEqual(result.content, bytes([0b00100000, 0]))
+
+    def test_seat_map_ignores_other_performances(self):
+        other = sample_performance(theatre_hall=self.performance.theatre_hall)
+        sample_ticket(other, self.user, row=1, seat=1)
+
+        result = self.client.get(seat_map_url(self.performance.id))
+
+        self.assertEqual(
+            base64.b64decode(result.data["taken_place"]), bytes(2)
+        )
+
+
+class PerformanceSeatHoldTest(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "hans@zimmer.com",
+            "inception",
+        )
+        self.other_user = get_user_model().objects.create_user(
+            "john@williams.com",
+            "starwars",
+        )
+        self.performance = sample_performance()
+
+        self.client.force_authenticate(self.user)
+
+    def hold(self, *seats, **payload):
+        payload["seats"] = [{"row": row, "seat": seat} for row, seat in seats]
+        return self.client.post(
+            hold_url(self.performance.id), payload, format="json"
+        )
+
+    def test_hold_seats(self):
+        result = self.hold((1, 1), (1, 2), minutes=5)
+
+        self.assertEqual(result.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            result.data["seats"],
+            [{"row": 1, "seat": 1}, {"row": 1, "seat": 2}],
+        )
+        holds = SeatHold.objects.filter(user=self.user)
+        self.assertEqual(holds.count(), 2)
+        self.assertAlmostEqual(
+            holds[0].expires_at,
+            timezone.now() + timedelta(minutes=5),
+            delta=timedelta(seconds=30),
+        )
+
+    def test_hold_seat_out_of_hall_range(self):
+        result = self.hold((4, 1))
+
+        self.assertEqual(result.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(SeatHold.objects.exists())
+
+    def test_hold_seat_held_by_other_user(self):
+        SeatHold.objects.create(
+            performance=self.performance,
+            user=self.other_user,
+            row=1,
+            seat=2,
+            expires_at=timezone.now() + timedelta(minutes=5),
+        )
+
+        result = self.hold((1, 1), (1, 2))
+
+        self.assertEqual(result.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(result.data["seats"][0], {})
+        self.assertIn("non_field_errors", result.data["seats"][1])
+
+    def test_hold_seat_sold(self):
+        sample_ticket(self.performance, self.other_user, row=1, seat=1)
+
+        result = self.hold((1, 1))
+
+        self.assertEqual(result.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_expired_hold_is_reclaimed(self):
+        SeatHold.objects.create(
+            performance=self.performance,
+            user=self.other_user,
+            row=1,
+            seat=1,
+            expires_at=timezone.now() - timedelta(seconds=1),
+        )
+
+        result = self.hold((1, 1))
+
+        self.assertEqual(result.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(SeatHold.objects.get().user, self.user)
+
+    def test_hold_again_extends_hold(self):
+        self.hold((1, 1), minutes=1)
+
+        result = self.hold((1, 1), minutes=10)
+
+        self.assertEqual(result.status_code, status.HTTP_201_CREATED)
+        self.assertGreater(
+            SeatHold.objects.get().expires_at,
+            timezone.now() + timedelta(minutes=9),
+        )
+
+    def test_release_holds(self):
+        self.hold((1, 1), (1, 2))
+
+        result = self.client.delete(hold_url(self.performance.id))
+
+        self.assertEqual(result.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(SeatHold.objects.exists())
+
+
+class PerformanceSeatAllocationTest(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "hans@zimmer.com",
+            "inception",
+        )
+        self.performance = sample_performance()
+
+        self.client.force_authenticate(self.user)
+
+    def allocate(self, **params):
+        return self.client.post(
+            f"{allocate_url(self.performance.id)}?"
+            + "&".join(f"{key}={value}" for key, value in params.items())
+        )
+
+    def test_allocate_centre_seats(self):
+        result = self.allocate(count=3)
+
+        self.assertEqual(result.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            result.data["seats"],
+            [
+                {"row": 2, "seat": 2},
+                {"row": 2, "seat": 3},
+                {"row": 2, "seat": 4},
+            ],
+        )
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_allocate_skips_taken_and_held_seats(self):
+        sample_ticket(self.performance, self.user, row=2, seat=3)
+        SeatHold.objects.create(
+            performance=self.performance,
+            user=get_user_model().objects.create_user(
+                "john@williams.com", "starwars"
+            ),
+            row=1,
+            seat=3,
+            expires_at=timezone.now() + timedelta(minutes=5),
+        )
+
+        result = self.allocate(count=3)
+
+        self.assertEqual(
+            result.data["seats"],
+            [
+                {"row": 3, "seat": 2},
+                {"row": 3, "seat": 3},
+                {"row": 3, "seat": 4},
+            ],
+        )
+
+    def test_allocate_and_reserve(self):
+        result = self.allocate(count=2, reserve="true")
+
+        self.assertEqual(result.status_code, status.HTTP_201_CREATED)
+        reservation = Reservation.objects.get(id=result.data["id"])
+        self.assertEqual(reservation.user, self.user)
+        self.assertEqual(
+            list(reservation.tickets.values_list("row", "seat")),
+            [(2, 2), (2, 3)],
+        )
+
+    def test_allocate_and_reserve_skips_seats_held_meanwhile(self):
+        SeatHold.objects.create(
+            performance=self.performance,
+            user=get_user_model().objects.create_user(
+                "john@williams.com", "starwars"
+            ),
+            row=2,
+            seat=2,
+            expires_at=timezone.now() + timedelta(minutes=5),
+        )
+        # the hold is only seen by the second search
+        occupied = iter([[], [(2, 2)]])
+
+        with mock.patch(
+            "performance.views.occupied_seats",
+            side_effect=lambda *args: next(occupied),
+        ):
+            result = self.allocate(count=2, reserve="true")
+
+        self.assertEqual(result.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn((2, 2), Ticket.objects.values_list("row", "seat"))
+
+    def test_allocate_and_reserve_own_held_seats(self):
+        SeatHold.objects.create(
+            performance=self.performance,
+            user=self.user,
+            row=2,
+            seat=2,
+            expires_at=timezone.now() + timedelta(minutes=5),
+        )
+
+        result = self.allocate(count=2, reserve="true")
+
+        self.assertEqual(result.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            list(Ticket.objects.values_list("row", "seat")), [(2, 2), (2, 3)]
+        )
+        self.assertFalse(SeatHold.objects.exists())
+
+    def test_allocate_no_adjacent_seats(self):
+        for row in range(1, 4):
+            sample_ticket(self.performance, self.user, row=row, seat=3)
+
+        result = self.allocate(count=3)
+
+        self.assertEqual(result.status_code, status.HTTP_409_CONFLICT)
+
+    def test_allocate_count_out_of_row_range(self):
+        result = self.allocate(count=6)
+
+        self.assertEqual(result.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("count", result.data)
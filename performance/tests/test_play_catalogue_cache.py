@@ -0,0 +1,120 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from performance.models import Actor, Genre, Play
+from performance.views import PlayViewSet
+
+PLAY_URL = reverse("performance:play-list")
+
+class PlayCatalogueCacheTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        PlayViewSet.rendered_cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "hans@zimmer.com",
+            "inception",
+        )
+        self.genre1 = Genre.objects.create(name="Drama")
+        self.genre2 = Genre.objects.create(name="Comedy")
+        self.actor = Actor.objects.create(
+            first_name="Charlie", last_name="Chaplin"
+        )
+        self.play = Play.objects.create(
+            title="Hamlet", description="To be, or not to be"
+        )
+        self.play.genres.add(self.genre1, self.genre2)
+
+        self.client.force_authenticate(self.user)
+
+    def test_cached_catalogue_costs_no_queries(self):
+        first = self.client.get(PLAY_URL)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(PLAY_URL)
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["Content-Type"], first["Content-Type"])
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_equivalent_queries_share_entry(self):
+        self.client.get(
+            PLAY_URL,
+            {"title": "Ham", "genres": f"{self.genre2.id},{self.genre1.id}"},
+        )
+
+        with self.assertNumQueries(0):
+            result = self.client.get(
+                PLAY_URL,
+                {
+                    "title": " ham",
+                    "genres": f"{self.genre1.id},{self.genre2.id}",
+                },
+            )
+
+        self.assertEqual(result.json()["results"][0]["title"], "Hamlet")
+
+    def test_cached_catalogue_not_modified(self):
+        etag = self.client.get(PLAY_URL)["ETag"]
+
+        with self.assertNumQueries(0):
+            result = self.client.get(PLAY_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(result.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_play_change_invalidates(self):
+        self.client.get(PLAY_URL)
+
+        self.play.title = "Macbeth"
+        self.play.save()
+
+        self.assertEqual(
+            self.client.get(PLAY_URL).json()["results"][0]["title"], "Macbeth"
+        )
+
+    def test_relation_changes_invalidate(self):
+        self.client.get(PLAY_URL)
+
+        self.play.actors.add(self.actor)
+        self.assertEqual(
+            self.client.get(PLAY_URL).json()["results"][0]["actors"],
+            ["Charlie Chaplin"],
+        )
+
+        self.genre1.name = "Tragedy"
+        self.genre1.save()
+        self.assertEqual(
+            self.client.get(PLAY_URL).json()["results"][0]["genres"],
+            ["Comedy", "Tragedy"],
+        )
+
+    def test_shared_entry_filters_by_normalized_text(self):
+        self.client.get(PLAY_URL, {"title": "hamlet "})
+
+        result = self.client.get(PLAY_URL, {"title": "Hamlet"})
+
+        self.assertEqual(result.json()["results"][0]["title"], "Hamlet")
+
+        PlayViewSet.rendered_cache.clear()
+        result = self.client.get(PLAY_URL, {"title": "hamlet "})
+
+        self.assertEqual(len(result.json()["results"]), 1)
+
+    def test_entries_are_per_host(self):
+        Play.objects.filter(pk=self.play.pk).update(
+            image="uploads/plays/hamlet.jpg"
+        )
+        self.client.get(PLAY_URL)
+
+        result = self.client.get(PLAY_URL, SERVER_NAME="localhost")
+
+        self.assertEqual(
+            result.json()["results"][0]["image"],
+            "http://localhost/media/uploads/plays/hamlet.jpg",
+        )
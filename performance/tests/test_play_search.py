@@ -0,0 +1,73 @@
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from performance.models import Play, Genre, Actor
+
+
+PLAY_URL = reverse("performance:play-list")
+
+
+class PlaySearchTest(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "hans@zimmer.com",
+            "inception",
+        )
+        self.hamlet = Play.objects.create(
+            title="Hamlet",
+            description="The prince of Denmark avenges his father",
+        )
+        self.lear = Play.objects.create(
+            title="King Lear",
+            description="An old king divides his kingdom",
+        )
+
+        self.client.force_authenticate(self.user)
+
+    def search(self, search: str) -> list:
+        result = self.client.get(PLAY_URL, {"search": search})
+        self.assertEqual(result.status_code, status.HTTP_200_OK)
+        return [play["id"] for play in result.data]
+
+    def test_search_matches_description(self):
+        self.assertEqual(self.search("denmark"), [self.hamlet.id])
+
+    @skipUnless(connection.vendor == "postgresql", "needs PostgreSQL")
+    def test_search_ranks_title_first(self):
+        kings = Play.objects.create(
+            title="Richard III", description="A king of England"
+        )
+
+        self.assertEqual(self.search("king"), [self.lear.id, kings.id])
+
+    @skipUnless(connection.vendor == "postgresql", "needs PostgreSQL")
+    def test_search_tolerates_typos(self):
+        self.assertEqual(self.search("Hamlte"), [self.hamlet.id])
+
+    @skipUnless(connection.vendor == "postgresql", "needs PostgreSQL")
+    def test_search_follows_actors_and_genres(self):
+        actor = Actor.objects.create(
+            first_name="Laurence", last_name="Olivier"
+        )
+        genre = Genre.objects.create(name="Tragedy")
+        self.hamlet.actors.add(actor)
+        self.lear.genres.add(genre)
+
+        self.assertEqual(self.search("olivier"), [self.hamlet.id])
+        self.assertEqual(self.search("tragedy"), [self.lear.id])
+
+        actor.last_name = "Gielgud"
+        actor.save()
+        genre.delete()
+
+        self.assertEqual(self.search("olivier"), [])
+        self.assertEqual(self.search("gielgud"), [self.hamlet.id])
+        self.assertEqual(self.search("tragedy"), [])
@@ -1,5 +1,7 @@
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from rest_framework import status
@@ -7,6 +9,7 @@ from rest_framework.test import APIClient
 
 from performance.models import Play, Genre, Actor
 from performance.serializers import PlayListSerializer, PlayDetailSerializer
+from performance.views import PlayViewSet
 
 
 PLAY_URL = reverse("performance:play-list")
@@ -89,7 +92,7 @@ class AuthenticatedPlayViewSetTest(TestCase):
         serializer = PlayListSerializer(plays, many=True)
 
         self.assertEqual(result.status_code, status.HTTP_200_OK)
-        self.assertEqual(result.data, serializer.data)
+        self.assertEqual(result.data["results"], serializer.data)
 
     def test_play_filter_by_title(self):
         result = self.client.get(PLAY_URL, {"title": "play"})
@@ -98,9 +101,9 @@ class AuthenticatedPlayViewSetTest(TestCase):
         serializer2 = PlayListSerializer(self.play2)
         serializer3 = PlayListSerializer(self.play3)
 
-        self.assertIn(serializer1.data, result.data)
-        self.assertIn(serializer2.data, result.data)
-        self.assertNotIn(serializer3.data, result.data)
+        self.assertIn(serializer1.data, result.data["results"])
+        self.assertIn(serializer2.data, result.data["results"])
+        self.assertNotIn(serializer3.data, result.data["results"])
 
     def test_play_filter_by_genre(self):
         play_with_genre1 = self.play1.genres.add(self.genre1)
@@ -117,9 +120,9 @@ class AuthenticatedPlayViewSetTest(TestCase):
         serializer2 = PlayListSerializer(play_with_genre2)
         serializer3 = PlayListSerializer(play_without_genre)
 
-        self.assertIn(serializer1.data, result.data)
-        self.assertIn(serializer2.data, result.data)
-        self.assertNotIn(serializer3.data, result.data)
+        self.assertIn(serializer1.data, result.data["results"])
+        self.assertIn(serializer2.data, result.data["results"])
+        self.assertNotIn(serializer3.data, result.data["results"])
 
     def test_play_filter_by_actor(self):
         play_with_actor1 = self.play1.actors.add(self.actor1)
@@ -136,9 +139,9 @@ class AuthenticatedPlayViewSetTest(TestCase):
         serializer2 = PlayListSerializer(play_with_actor2)
         serializer3 = PlayListSerializer(play_without_actor)
 
-        self.assertIn(serializer1.data, result.data)
-        self.assertIn(serializer2.data, result.data)
-        self.assertNotIn(serializer3.data, result.data)
+        self.assertIn(serializer1.data, result.data["results"])
+        self.assertIn(serializer2.data, result.data["results"])
+        self.assertNotIn(serializer3.data, result.data["results"])
 
     def test_retrieve_play_detail(self):
         play = sample_play()
@@ -162,6 +165,82 @@ class AuthenticatedPlayViewSetTest(TestCase):
         self.assertEqual(result.status_code, status.HTTP_403_FORBIDDEN)
 
 
+class PlayRelationFilterTest(TestCase):
+    def setUp(self) -> None:
+        PlayViewSet.rendered_cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "hans@zimmer.com",
+            "inception",
+        )
+
+        self.drama = sample_genre(name="Drama")
+        self.comedy = sample_genre(name="Comedy")
+        self.dramedy = sample_play(title="Dramedy")
+        self.dramedy.genres.add(self.drama, self.comedy)
+        self.tragedy = sample_play(title="Tragedy")
+        self.tragedy.genres.add(self.drama)
+        sample_play(title="Musical")
+
+        self.client.force_authenticate(self.user)
+
+    def listed_titles(self, **params) -> list:
+        result = self.client.get(PLAY_URL, params)
+        return [play["title"] for play in result.json()["results"]]
+
+    def test_filter_by_any_genre_lists_plays_once(self):
+        self.assertEqual(
+            self.listed_titles(genres=f"{self.drama.id},{self.comedy.id}"),
+            ["Dramedy", "Tragedy"],
+        )
+
+    def test_filter_by_all_genres(self):
+        self.assertEqual(
+            self.listed_titles(
+                genres=f"{self.drama.id},{self.comedy.id}", match="all"
+            ),
+            ["Dramedy"],
+        )
+
+    def test_match_is_case_insensitive(self):
+        genres = f"{self.drama.id},{self.comedy.id}"
+
+        self.assertEqual(
+            self.listed_titles(genres=genres, match="ALL"), ["Dramedy"]
+        )
+        self.assertEqual(
+            self.listed_titles(genres=genres, match="all"), ["Dramedy"]
+        )
+
+    def test_filter_by_genres_and_actors(self):
+        actor = sample_actor()
+        self.tragedy.actors.add(actor)
+
+        self.assertEqual(
+            self.listed_titles(genres=self.drama.id, actors=actor.id),
+            ["Tragedy"],
+        )
+
+    def test_malformed_ids_rejected(self):
+        for params in ({"genres": "x"}, {"actors": f"{self.drama.id},"}):
+            result = self.client.get(PLAY_URL, params)
+
+            self.assertEqual(result.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn(next(iter(params)), result.data)
+
+    def test_filter_uses_subqueries(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(PLAY_URL, {"genres": self.drama.id})
+
+        plays_query = next(
+            query["sql"] for query in queries
+            if query["sql"].startswith('SELECT "performance_play"."id"')
+        )
+        self.assertIn("EXISTS", plays_query)
+        self.assertNotIn("DISTINCT", plays_query)
+        self.assertNotIn("JOIN", plays_query)
+
+
 class AdminPlayApiTest(TestCase):
     def setUp(self) -> None:
         self.client = APIClient()
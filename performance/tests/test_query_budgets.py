@@ -0,0 +1,185 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from performance.models import (
+    Actor,
+    Genre,
+    Performance,
+    Play,
+    Reservation,
+    TheatreHall,
+    Ticket,
+)
+from performance.tests.query_budget import QueryBudgetMixin
+
+
+PAGE = {"page_size": 100}
+
+
+class ViewSetQueryBudgetTest(QueryBudgetMixin, TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "hans@zimmer.com",
+            "inception",
+        )
+        self.theatre_hall = TheatreHall.objects.create(
+            name="Blue", rows=20, seats_in_row=20
+        )
+        self.play = Play.objects.create(
+            title="Hamlet", description="To be, or not to be"
+        )
+        self.performance = Performance.objects.create(
+            play=self.play, theatre_hall=self.theatre_hall
+        )
+        self.sold = 0
+
+        self.client.force_authenticate(self.user)
+
+    def add_plays(self, count: int) -> None:
+        genre = Genre.objects.create(name=f"Genre {Genre.objects.count()}")
+        actor = Actor.objects.create(first_name="Charlie", last_name="Chaplin")
+
+        for _ in range(count):
+            play = Play.objects.create(title="Macbeth", description="")
+            play.genres.add(genre)
+            play.actors.add(actor)
+
+    def add_performances(self, count: int) -> None:
+        for _ in range(count):
+            Performance.objects.create(
+                play=Play.objects.create(title="Macbeth", description=""),
+                theatre_hall=TheatreHall.objects.create(
+                    name="Red", rows=5, seats_in_row=5
+                ),
+            )
+
+    def add_tickets(self, count: int) -> None:
+        """A reservation of count tickets for a new performance"""
+        reservation = Reservation.objects.create(user=self.user)
+        performance = Performance.objects.create(
+            play=Play.objects.create(title="Macbeth", description=""),
+            theatre_hall=self.theatre_hall,
+        )
+
+        for seat in range(1, count + 1):
+            Ticket.objects.create(
+                reservation=reservation,
+                performance=performance,
+                row=1,
+                seat=seat,
+            )
+
+    def add_performance_tickets(self, count: int) -> None:
+        """count tickets for self.performance"""
+        reservation = Reservation.objects.create(user=self.user)
+
+        for _ in range(count):
+            self.sold += 1
+            Ticket.objects.create(
+                reservation=reservation,
+                performance=self.performance,
+                row=(self.sold - 1) // 20 + 1,
+                seat=(self.sold - 1) % 20 + 1,
+            )
+
+    def test_actor_list(self):
+        self.assertQueryBudget(
+            reverse("performance:actor-list"),
+            1,
+            lambda count: Actor.objects.bulk_create(
+                Actor(first_name="Charlie", last_name="Chaplin")
+                for _ in range(count)
+            ),
+        )
+
+    def test_genre_list(self):
+        self.assertQueryBudget(
+            reverse("performance:genre-list"),
+            1,
+            lambda count: Genre.objects.bulk_create(
+                Genre(name=f"Genre {Genre.objects.count()} {number}")
+                for number in range(count)
+            ),
+        )
+
+    def test_theatre_hall_list(self):
+        self.assertQueryBudget(
+            reverse("performance:theatrehall-list"),
+            1,
+            lambda count: TheatreHall.objects.bulk_create(
+                TheatreHall(name="Red", rows=5, seats_in_row=5)
+                for _ in range(count)
+            ),
+        )
+
+    def test_play_list(self):
+        self.assertQueryBudget(
+            reverse("performance:play-list"), 4, self.add_plays, params=PAGE
+        )
+
+    def test_play_search(self):
+        self.assertQueryBudget(
+            reverse("performance:play-list"),
+            4,
+            self.add_plays,
+            params={"search": "macbeth"},
+        )
+
+    def test_play_detail(self):
+        self.assertQueryBudget(
+            reverse("performance:play-detail", args=[self.play.id]),
+            3,
+            lambda count: self.play.actors.add(
+                *Actor.objects.bulk_create(
+                    Actor(first_name="Charlie", last_name="Chaplin")
+                    for _ in range(count)
+                )
+            ),
+        )
+
+    def test_performance_list(self):
+        self.assertQueryBudget(
+            reverse("performance:performance-list"),
+            2,
+            self.add_performances,
+            params=PAGE,
+        )
+
+    def test_performance_summary_list(self):
+        self.assertQueryBudget(
+            reverse("performance:performance-list"),
+            2,
+            self.add_performances,
+            params={**PAGE, "summary": "true"},
+        )
+
+    def test_performance_detail(self):
+        self.assertQueryBudget(
+            reverse(
+                "performance:performance-detail", args=[self.performance.id]
+            ),
+            2,
+            self.add_performance_tickets,
+        )
+
+    def test_performance_seat_map(self):
+        self.assertQueryBudget(
+            reverse(
+                "performance:performance-seat-map",
+                args=[self.performance.id],
+            ),
+            2,
+            self.add_performance_tickets,
+        )
+
+    def test_reservation_list(self):
+        self.assertQueryBudget(
+            reverse("performance:reservation-list"),
+            3,
+            self.add_tickets,
+            params=PAGE,
+        )
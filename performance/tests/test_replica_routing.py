@@ -0,0 +1,131 @@
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from config.db_router import ReplicaRouter, read_database
+from performance.models import Genre, Play, Performance, TheatreHall
+
+
+GENRE_URL = reverse("performance:genre-list")
+RESERVATION_URL = reverse("performance:reservation-list")
+
+
+@override_settings(DATABASE_REPLICAS=["replica_1"])
+class ReplicaRouterTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "hans@zimmer.com",
+            "inception",
+        )
+        self.performance = Performance.objects.create(
+            play=Play.objects.create(title="Hamlet", description=""),
+            theatre_hall=TheatreHall.objects.create(
+                name="Blue", rows=5, seats_in_row=5
+            ),
+        )
+        self.reads = []
+
+        # record where reads would go, but run them on the test database
+        def db_for_read(router, model, **hints):
+            self.reads.append(read_database.get() or "default")
+            return "default"
+
+        patcher = mock.patch.object(
+            ReplicaRouter,
+            "db_for_read",
+            autospec=True,
+            side_effect=db_for_read,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.client.force_authenticate(self.user)
+
+    def test_safe_requests_read_from_replica(self):
+        result = self.client.get(GENRE_URL)
+
+        self.assertEqual(result.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(self.reads), {"replica_1"})
+
+    def test_unsafe_requests_use_primary(self):
+        self.client.post(
+            RESERVATION_URL,
+            {
+                "tickets": [
+                    {"performance": self.performance.id, "row": 1, "seat": 1}
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(set(self.reads), {"default"})
+
+    def test_user_reads_own_writes_after_reservation(self):
+        self.client.post(
+            RESERVATION_URL,
+            {
+                "tickets": [
+                    {"performance": self.performance.id, "row": 1, "seat": 1}
+                ]
+            },
+            format="json",
+        )
+        self.reads.clear()
+
+        result = self.client.get(RESERVATION_URL)
+
+        self.assertEqual(len(result.data["results"]), 1)
+        self.assertEqual(set(self.reads), {"default"})
+
+    def test_failed_write_does_not_pin_user(self):
+        self.client.post(RESERVATION_URL, {}, format="json")
+        self.reads.clear()
+
+        self.client.get(RESERVATION_URL)
+
+        self.assertEqual(set(self.reads), {"replica_1"})
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas_reads_from_primary(self):
+        self.client.get(GENRE_URL)
+
+        self.assertEqual(set(self.reads), {"default"})
+
+
+@skipUnless(settings.DATABASE_REPLICAS, "set POSTGRES_REPLICA_HOSTS")
+class ReplicaDatabaseTest(TransactionTestCase):
+    # replicas mirror the test database, committed rows are visible there
+    databases = {"default", *settings.DATABASE_REPLICAS}
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "hans@zimmer.com",
+            "inception",
+        )
+
+        self.client.force_authenticate(self.user)
+
+    def test_catalogue_served_by_replica(self):
+        replica = connections[settings.DATABASE_REPLICAS[0]]
+
+        Genre.objects.create(name="Drama")
+
+        with CaptureQueriesContext(replica) as queries:
+            result = self.client.get(GENRE_URL)
+
+        self.assertEqual(result.status_code, status.HTTP_200_OK)
+        self.assertEqual(result.data[0]["name"], "Drama")
+        self.assertTrue(queries)
@@ -0,0 +1,403 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from performance.models import (
+    Play,
+    Performance,
+    TheatreHall,
+    Reservation,
+    Ticket,
+    SeatHold,
+    ReservationRequest,
+)
+from performance import reservations
+from performance.reservations import process_performance_queue
+
+
+RESERVATION_URL = reverse("performance:reservation-list")
+
+
+def request_status_url(request_id) -> str:
+    return reverse("performance:reservation-request", args=[request_id])
+
+
+def sample_performance(**params) -> Performance:
+    defaults = {
+        "play": Play.objects.create(
+            title="Hamlet",
+            description="To be, or not to be",
+        ),
+        "theatre_hall": TheatreHall.objects.create(
+            name="Blue", rows=10, seats_in_row=10
+        ),
+    }
+    defaults.update(params)
+
+    return Performance.objects.create(**defaults)
+
+
+def tickets_payload(performance: Performance, *seats) -> dict:
+    return {
+        "tickets": [
+            {"performance": performance.id, "row": row, "seat": seat}
+            for row, seat in seats
+        ]
+    }
+
+
+class UnauthenticatedReservationViewSetTest(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+
+    def test_auth_required(self) -> None:
+        result = self.client.get(RESERVATION_URL)
+        self.assertEqual(result.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class AuthenticatedReservationViewSetTest(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "hans@zimmer.com",
+            "inception",
+        )
+        self.performance = sample_performance()
+
+        self.client.force_authenticate(self.user)
+
+    def test_create_group_reservation(self):
+        payload = tickets_payload(
+            self.performance, *[(5, seat) for seat in range(1, 11)]
+        )
+
+        result = self.client.post(RESERVATION_URL, payload, format="json")
+
+        self.assertEqual(result.status_code, status.HTTP_201_CREATED)
+        reservation = Reservation.objects.get(id=result.data["id"])
+        self.assertEqual(reservation.user, self.user)
+        self.assertEqual(reservation.tickets.count(), 10)
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.seats_sold, 10)
+        self.assertEqual(self.performance.tickets_available, 90)
+
+    def test_group_reservation_query_count_does_not_grow(self):
+        with CaptureQueriesContext(connection) as single:
+            self.client.post(
+                RESERVATION_URL,
+                tickets_payload(self.performance, (1, 1)),
+                format="json",
+            )
+
+        with CaptureQueriesContext(connection) as group:
+            self.client.post(
+                RESERVATION_URL,
+                tickets_payload(
+                    self.performance, *[(5, seat) for seat in range(1, 11)]
+                ),
+                format="json",
+            )
+
+        self.assertEqual(len(group), len(single))
+
+    def test_seat_out_of_hall_range(self):
+        payload = tickets_payload(self.performance, (1, 1), (11, 1))
+
+        result = self.client.post(RESERVATION_URL, payload, format="json")
+
+        self.assertEqual(result.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(result.data["tickets"][0], {})
+        self.assertIn("row", result.data["tickets"][1])
+        self.assertFalse(Reservation.objects.exists())
+
+    def test_taken_seat_reported(self):
+        self.client.post(
+            RESERVATION_URL,
+            tickets_payload(self.performance, (1, 2)),
+            format="json",
+        )
+
+        result = self.client.post(
+            RESERVATION_URL,
+            tickets_payload(self.performance, (1, 1), (1, 2)),
+            format="json",
+        )
+
+        self.assertEqual(result.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(result.data["tickets"][0], {})
+        self.assertIn("non_field_errors", result.data["tickets"][1])
+        self.assertEqual(Ticket.objects.count(), 1)
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.seats_sold, 1)
+
+    def test_repeated_seat_reported(self):
+        result = self.client.post(
+            RESERVATION_URL,
+            tickets_payload(self.performance, (1, 1), (1, 1)),
+            format="json",
+        )
+
+        self.assertEqual(result.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("non_field_errors", result.data["tickets"][1])
+        self.assertFalse(Ticket.objects.exists())
+
+
+class SeatHoldReservationTest(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "hans@zimmer.com",
+            "inception",
+        )
+        self.other_user = get_user_model().objects.create_user(
+            "john@williams.com",
+            "starwars",
+        )
+        self.performance = sample_performance()
+
+        self.client.force_authenticate(self.user)
+
+    def sample_hold(self, user, row: int, seat: int, minutes: int = 5):
+        return SeatHold.objects.create(
+            performance=self.performance,
+            user=user,
+            row=row,
+            seat=seat,
+            expires_at=timezone.now() + timedelta(minutes=minutes),
+        )
+
+    def test_reserve_held_seats(self):
+        self.sample_hold(self.user, 2, 3)
+        self.sample_hold(self.user, 2, 4)
+
+        result = self.client.post(
+            RESERVATION_URL, {"hold": self.performance.id}, format="json"
+        )
+
+        self.assertEqual(result.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [
+                (ticket["row"], ticket["seat"])
+                for ticket in result.data["tickets"]
+            ],
+            [(2, 3), (2, 4)],
+        )
+        self.assertFalse(SeatHold.objects.exists())
+
+    def test_reserve_without_held_seats(self):
+        self.sample_hold(self.user, 2, 3, minutes=-1)
+
+        result = self.client.post(
+            RESERVATION_URL, {"hold": self.performance.id}, format="json"
+        )
+
+        self.assertEqual(result.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("hold", result.data)
+
+    def test_reserve_without_tickets(self):
+        result = self.client.post(RESERVATION_URL, {}, format="json")
+
+        self.assertEqual(result.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("tickets", result.data)
+
+    def test_own_held_seat_can_be_reserved(self):
+        self.sample_hold(self.user, 1, 1)
+
+        result = self.client.post(
+            RESERVATION_URL,
+            tickets_payload(self.performance, (1, 1)),
+            format="json",
+        )
+
+        self.assertEqual(result.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(SeatHold.objects.exists())
+
+    def test_seat_held_by_other_user_reported(self):
+        self.sample_hold(self.other_user, 1, 1)
+
+        result = self.client.post(
+            RESERVATION_URL,
+            tickets_payload(self.performance, (1, 1)),
+            format="json",
+        )
+
+        self.assertEqual(result.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("non_field_errors", result.data["tickets"][0])
+        self.assertFalse(Ticket.objects.exists())
+
+
+@override_settings(RESERVATION_ENGINE="claim", RESERVATION_RETRY_DELAY=0)
+class ClaimReservationEngineTest(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "hans@zimmer.com",
+            "inception",
+        )
+        self.performance = sample_performance()
+
+        self.client.force_authenticate(self.user)
+
+    def test_create_reservation(self):
+        result = self.client.post(
+            RESERVATION_URL,
+            tickets_payload(self.performance, (1, 1), (1, 2)),
+            format="json",
+        )
+
+        self.assertEqual(result.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Ticket.objects.count(), 2)
+
+    @mock.patch("performance.serializers.validate_seats_available")
+    def test_lost_seats_reported_with_conflict(self, validate_seats_available):
+        # the seat is sold after the request was validated
+        self.client.post(
+            RESERVATION_URL,
+            tickets_payload(self.performance, (1, 2)),
+            format="json",
+        )
+
+        result = self.client.post(
+            RESERVATION_URL,
+            tickets_payload(self.performance, (1, 1), (1, 2), (1, 3)),
+            format="json",
+        )
+
+        self.assertEqual(result.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            result.data["seats"],
+            [{"performance": self.performance.id, "row": 1, "seat": 2}],
+        )
+        self.assertEqual(Reservation.objects.count(), 1)
+        self.assertEqual(Ticket.objects.count(), 1)
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.seats_sold, 1)
+
+    def test_transient_error_retried(self):
+        claim_tickets = reservations.claim_tickets
+        calls = []
+
+        def deadlock_once(reservation, tickets):
+            calls.append(reservation)
+            if len(calls) == 1:
+                raise OperationalError("deadlock detected")
+            claim_tickets(reservation, tickets)
+
+        with mock.patch.object(
+            reservations, "claim_tickets", side_effect=deadlock_once
+        ):
+            result = self.client.post(
+                RESERVATION_URL,
+                tickets_payload(self.performance, (1, 1)),
+                format="json",
+            )
+
+        self.assertEqual(result.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(Reservation.objects.count(), 1)
+
+    @override_settings(RESERVATION_RETRIES=1)
+    def test_retries_are_bounded(self):
+        with mock.patch.object(
+            reservations,
+            "claim_tickets",
+            side_effect=OperationalError("deadlock detected"),
+        ) as claim_tickets:
+            with self.assertRaises(OperationalError):
+                self.client.post(
+                    RESERVATION_URL,
+                    tickets_payload(self.performance, (1, 1)),
+                    format="json",
+                )
+
+        self.assertEqual(claim_tickets.call_count, 2)
+        self.assertFalse(Reservation.objects.exists())
+
+
+@override_settings(RESERVATION_ASYNC=True)
+class AsyncReservationTest(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "hans@zimmer.com",
+            "inception",
+        )
+        self.performance = sample_performance()
+
+        self.client.force_authenticate(self.user)
+
+    def reserve(self, *seats):
+        return self.client.post(
+            RESERVATION_URL,
+            tickets_payload(self.performance, *seats),
+            format="json",
+        )
+
+    def test_reservation_is_queued(self):
+        result = self.reserve((1, 1), (1, 2))
+
+        self.assertEqual(result.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(result.data["status"], "pending")
+        self.assertEqual(
+            result["Location"], request_status_url(result.data["id"])
+        )
+        self.assertFalse(Reservation.objects.exists())
+        reservation_request = ReservationRequest.objects.get()
+        self.assertEqual(reservation_request.performance, self.performance)
+        self.assertEqual(
+            reservation_request.tickets,
+            [
+                {"performance": self.performance.id, "row": 1, "seat": 1},
+                {"performance": self.performance.id, "row": 1, "seat": 2},
+            ],
+        )
+
+    def test_invalid_reservation_is_not_queued(self):
+        result = self.reserve((11, 1))
+
+        self.assertEqual(result.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(ReservationRequest.objects.exists())
+
+    def test_queue_processed_in_order(self):
+        first = self.reserve((1, 1), (1, 2)).data["id"]
+        second = self.reserve((1, 2)).data["id"]
+        third = self.reserve((1, 3)).data["id"]
+
+        self.assertEqual(process_performance_queue(self.performance.id), 3)
+
+        outcomes = [
+            self.client.get(request_status_url(request_id)).data
+            for request_id in (first, second, third)
+        ]
+        self.assertEqual(
+            [outcome["status"] for outcome in outcomes],
+            ["done", "failed", "done"],
+        )
+        self.assertIn("tickets", outcomes[1]["errors"])
+        self.assertEqual(
+            Reservation.objects.get(id=outcomes[0]["reservation"]).user,
+            self.user,
+        )
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.seats_sold, 3)
+
+    def test_request_status_of_other_user_not_found(self):
+        request_id = self.reserve((1, 1)).data["id"]
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                "john@williams.com", "starwars"
+            )
+        )
+
+        result = self.client.get(request_status_url(request_id))
+
+        self.assertEqual(result.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,227 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from performance.models import (
+    Actor,
+    Genre,
+    Performance,
+    Play,
+    Reservation,
+    TheatreHall,
+    Ticket,
+)
+from performance.views import PlayViewSet
+
+
+ACTOR_URL = reverse("performance:actor-list")
+PLAY_URL = reverse("performance:play-list")
+PERFORMANCE_URL = reverse("performance:performance-list")
+RESERVATION_URL = reverse("performance:reservation-list")
+
+
+class SparseFieldsTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        PlayViewSet.rendered_cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "hans@zimmer.com",
+            "inception",
+        )
+        self.genre = Genre.objects.create(name="Drama")
+        self.actor = Actor.objects.create(
+            first_name="Charlie", last_name="Chaplin"
+        )
+        self.play = Play.objects.create(
+            title="Hamlet", description="To be, or not to be"
+        )
+        self.play.genres.add(self.genre)
+        self.play.actors.add(self.actor)
+        self.theatre_hall = TheatreHall.objects.create(
+            name="Blue", rows=10, seats_in_row=10
+        )
+        self.performance = Performance.objects.create(
+            play=self.play, theatre_hall=self.theatre_hall
+        )
+
+        self.client.force_authenticate(self.user)
+
+    def get(self, url: str, **params):
+        with CaptureQueriesContext(connection) as queries:
+            result = self.client.get(url, params)
+
+        self.assertEqual(result.status_code, status.HTTP_200_OK)
+        return result.json(), [query["sql"] for query in queries]
+
+    def test_play_list_fields(self):
+        data, queries = self.get(PLAY_URL, fields="id,title")
+
+        self.assertEqual(
+            data["results"], [{"id": self.play.id, "title": "Hamlet"}]
+        )
+        # 304 check and the page, genres and actors are not prefetched
+        self.assertEqual(len(queries), 2)
+
+    def test_play_list_expand(self):
+        data, _ = self.get(PLAY_URL, expand="genres", fields="id,genres")
+
+        self.assertEqual(
+            data["results"],
+            [
+                {
+                    "id": self.play.id,
+                    "genres": [{"id": self.genre.id, "name": "Drama"}],
+                }
+            ],
+        )
+
+    def test_play_detail_fields(self):
+        data, queries = self.get(
+            reverse("performance:play-detail", args=[self.play.id]),
+            fields="title,actors",
+        )
+
+        self.assertEqual(
+            data,
+            {
+                "title": "Hamlet",
+                "actors": [
+                    {
+                        "id": self.actor.id,
+                        "first_name": "Charlie",
+                        "last_name": "Chaplin",
+                        "full_name": "Charlie Chaplin",
+                    }
+                ],
+            },
+        )
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn("performance_genre", " ".join(queries))
+
+    def test_performance_list_fields_drop_joins(self):
+        data, queries = self.get(PERFORMANCE_URL, fields="id,show_time")
+
+        self.assertEqual(list(data["results"][0]), ["id", "show_time"])
+        self.assertNotIn("JOIN", " ".join(queries))
+
+    def test_performance_list_joins_only_needed_table(self):
+        data, queries = self.get(
+            PERFORMANCE_URL, fields="id,theatre_hall_name,tickets_available"
+        )
+
+        self.assertEqual(
+            data["results"],
+            [
+                {
+                    "id": self.performance.id,
+                    "theatre_hall_name": "Blue",
+                    "tickets_available": 100,
+                }
+            ],
+        )
+        self.assertIn("performance_theatrehall", queries[-1])
+        self.assertNotIn("performance_play", queries[-1])
+
+    def test_performance_list_expand(self):
+        data, _ = self.get(PERFORMANCE_URL, expand="play,theatre_hall")
+
+        performance = data["results"][0]
+        self.assertEqual(
+            performance["play"],
+            {
+                "id": self.play.id,
+                "title": "Hamlet",
+                "genres": ["Drama"],
+                "actors": ["Charlie Chaplin"],
+                "image": None,
+            },
+        )
+        self.assertEqual(performance["theatre_hall"]["capacity"], 100)
+        self.assertEqual(performance["play_title"], "Hamlet")
+
+    def test_performance_list_expand_queries_do_not_grow(self):
+        _, single = self.get(PERFORMANCE_URL, expand="play")
+        for _ in range(3):
+            Performance.objects.create(
+                play=Play.objects.create(title="Macbeth", description=""),
+                theatre_hall=self.theatre_hall,
+            )
+
+        _, several = self.get(PERFORMANCE_URL, expand="play")
+
+        self.assertEqual(len(several), len(single))
+
+    def test_performance_detail_expand(self):
+        data, _ = self.get(
+            reverse(
+                "performance:performance-detail", args=[self.performance.id]
+            ),
+            expand="play",
+            fields="id,play",
+        )
+
+        self.assertEqual(data["play"]["title"], "Hamlet")
+        self.assertEqual(list(data), ["id", "play"])
+
+    def test_reservation_list_without_tickets(self):
+        reservation = Reservation.objects.create(user=self.user)
+        Ticket.objects.create(
+            performance=self.performance,
+            reservation=reservation,
+            row=1,
+            seat=1,
+        )
+
+        data, queries = self.get(RESERVATION_URL, fields="id")
+
+        self.assertEqual(data["results"], [{"id": reservation.id}])
+        self.assertNotIn("performance_ticket", " ".join(queries))
+
+    def test_actor_list_fields(self):
+        data, _ = self.get(ACTOR_URL, fields="full_name")
+
+        self.assertEqual(data, [{"full_name": "Charlie Chaplin"}])
+
+    def test_unknown_names_ignored(self):
+        data, _ = self.get(PLAY_URL, fields="id,rating", expand="director")
+
+        self.assertEqual(data["results"], [{"id": self.play.id}])
+
+    def test_writes_ignore_fields(self):
+        result = self.client.post(
+            f"{RESERVATION_URL}?fields=id",
+            {
+                "tickets": [
+                    {"performance": self.performance.id, "row": 1, "seat": 1}
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(result.status_code, status.HTTP_201_CREATED)
+        self.assertIn("tickets", result.data)
+
+    def test_performance_list_expand_not_modified_until_play_changes(self):
+        etag = self.client.get(PERFORMANCE_URL, {"expand": "play"})["ETag"]
+        result = self.client.get(
+            PERFORMANCE_URL, {"expand": "play"}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(result.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.genre.name = "Tragedy"
+        self.genre.save()
+        result = self.client.get(
+            PERFORMANCE_URL, {"expand": "play"}, HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(result.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            result.json()["results"][0]["play"]["genres"], ["Tragedy"]
+        )
@@ -1,9 +1,10 @@
 import os
+import shutil
 import tempfile
 
 from PIL import Image
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 
 from rest_framework.test import APIClient
@@ -69,7 +70,16 @@ def detail_url(play_id):
     return reverse("performance:play-detail", args=[play_id])
 
 
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
 class PlayImageUploadTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
     def setUp(self):
         self.client = APIClient()
         self.user = get_user_model().objects.create_superuser(
@@ -151,7 +161,7 @@ class PlayImageUploadTests(TestCase):
             self.client.post(url, {"image": ntf}, format="multipart")
         res = self.client.get(PLAY_URL)
 
-        self.assertIn("image", res.data[0].keys())
+        self.assertIn("image", res.data["results"][0].keys())
 
     def test_image_url_is_shown_on_performance_detail(self):
         url = image_upload_url(self.play.id)
@@ -162,4 +172,4 @@ class PlayImageUploadTests(TestCase):
             self.client.post(url, {"image": ntf}, format="multipart")
         res = self.client.get(PERFORMANCE_URL)
 
-        self.assertIn("play_image", res.data[0].keys())
+        self.assertIn("play_image", res.data["results"][0].keys())
@@ -0,0 +1,150 @@
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework.throttling import SimpleRateThrottle
+
+from config.checks import check_throttle_cache
+from config.throttling import GCRAUserRateThrottle
+
+
+GENRE_URL = reverse("performance:genre-list")
+
+
+class GCRAThrottleTest(TestCase):
+    def setUp(self) -> None:
+        caches["throttle"].clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "hans@zimmer.com",
+            "inception",
+        )
+        self.now = 1_000_000.0
+
+        self.client.force_authenticate(self.user)
+        patcher = mock.patch.object(
+            SimpleRateThrottle, "timer", side_effect=lambda: self.now
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.dict(
+            GCRAUserRateThrottle.THROTTLE_RATES, {"user": "3/min"}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get(self):
+        return self.client.get(GENRE_URL)
+
+    def test_burst_up_to_rate(self):
+        for _ in range(3):
+            self.assertEqual(self.get().status_code, status.HTTP_200_OK)
+
+        result = self.get()
+
+        self.assertEqual(
+            result.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        self.assertEqual(result["Retry-After"], "20")
+
+    def test_requests_allowed_again_after_interval(self):
+        for _ in range(4):
+            self.get()
+
+        self.now += 20
+
+        self.assertEqual(self.get().status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.get().status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+
+    def test_single_counter_per_client(self):
+        self.get()
+        self.get()
+
+        throttle = GCRAUserRateThrottle()
+        key = throttle.cache_format % {"scope": "user", "ident": self.user.pk}
+
+        self.assertEqual(
+            caches["throttle"].get(key), (self.now + 40) * 1000
+        )
+
+    def test_refused_requests_do_not_book_slots(self):
+        for _ in range(10):
+            self.get()
+
+        self.now += 20
+
+        self.assertEqual(self.get().status_code, status.HTTP_200_OK)
+
+    def test_concurrent_requests_share_counter(self):
+        clients = 20
+        barrier = threading.Barrier(clients)
+        allowed = []
+        request = mock.Mock(user=self.user)
+
+        def check():
+            throttle = GCRAUserRateThrottle()
+            barrier.wait()
+            allowed.append(throttle.allow_request(request, None))
+
+        get = LocMemCache.get
+
+        def slow_get(cache, *args, **kwargs):
+            value = get(cache, *args, **kwargs)
+            time.sleep(0.01)
+            return value
+
+        # requests interleave between reading and writing the counter
+        with mock.patch.object(LocMemCache, "get", slow_get):
+            threads = [threading.Thread(target=check) for _ in range(clients)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(allowed.count(True), 3)
+
+    def test_users_throttled_separately(self):
+        for _ in range(4):
+            self.get()
+
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                "john@williams.com", "starwars"
+            )
+        )
+
+        self.assertEqual(self.get().status_code, status.HTTP_200_OK)
+
+
+class ThrottleCacheCheckTest(SimpleTestCase):
+    def assertCheckIds(self, backend, ids) -> None:
+        with override_settings(CACHES={"throttle": {"BACKEND": backend}}):
+            self.assertEqual(
+                [message.id for message in check_throttle_cache(None)], ids
+            )
+
+    def test_process_local_cache_warns(self):
+        self.assertCheckIds(
+            "django.core.cache.backends.locmem.LocMemCache", ["config.W001"]
+        )
+
+    def test_non_atomic_cache_warns(self):
+        self.assertCheckIds(
+            "django.core.cache.backends.filebased.FileBasedCache",
+            ["config.W002"],
+        )
+
+    def test_shared_cache_passes(self):
+        self.assertCheckIds(
+            "django.core.cache.backends.redis.RedisCache", []
+        )
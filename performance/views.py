@@ -1,25 +1,58 @@
-from datetime import datetime
-
-from django.db.models import F, Count
+import base64
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import viewsets, mixins, status
 from rest_framework.decorators import action
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
+from django.db.models import Prefetch
 from django.db.models.query import QuerySet
 
+from config.db_router import ReplicaReadMixin
+from config.lru_cache import LRUCache
+from performance.cache import (
+    CachedListMixin,
+    ConditionalListMixin,
+    RenderedListCacheMixin,
+)
+from performance.exceptions import SeatsUnavailable
+from performance.fast_serializers import (
+    ActorValuesSerializer,
+    PerformanceListValuesSerializer,
+    PlayListValuesSerializer,
+    ValuesListMixin,
+)
+from performance.fieldsets import SPARSE_FIELDS_PARAMETERS, SparseFieldsMixin
+from performance.filters import filter_related
 from performance.models import (
+    ArchivedTicket,
     Performance,
+    PerformanceSummary,
     Actor,
     Genre,
     TheatreHall,
     Play,
     Reservation,
+    ReservationRequest,
+    Ticket,
+)
+from performance.pagination import (
+    PerformancePagination,
+    PlayPagination,
+    ReservationPagination,
 )
 from performance.pernissions import IsAdminOrIfAuthenticatedReadOnly
+from performance.search import search_plays
+from performance.seating import best_block, pack_seats
 from performance.serializers import (
     ActorSerializer,
     GenreSerializer,
@@ -31,22 +64,44 @@ from performance.serializers import (
     PerformanceDetailSerializer,
     PerformanceSerializer,
     PerformanceListSerializer,
+    PerformanceSummarySerializer,
     ReservationSerializer,
     ReservationListSerializer,
+    ReservationRequestSerializer,
+    SeatHoldSerializer,
+    SeatAllocationSerializer,
+)
+from performance.reservations import (
+    create_reservation,
+    occupied_seats,
+    release_holds,
+    validate_seats_available,
 )
 
 
 class ActorViewSet(
+    ReplicaReadMixin,
+    SparseFieldsMixin,
+    CachedListMixin,
+    ValuesListMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     GenericViewSet,
 ):
     queryset = Actor.objects.all()
     serializer_class = ActorSerializer
+    values_serializer_class = ActorValuesSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
 
+    @extend_schema(parameters=SPARSE_FIELDS_PARAMETERS)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
 
 class GenreViewSet(
+    ReplicaReadMixin,
+    SparseFieldsMixin,
+    CachedListMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     GenericViewSet,
@@ -55,8 +110,15 @@ class GenreViewSet(
     serializer_class = GenreSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
 
+    @extend_schema(parameters=SPARSE_FIELDS_PARAMETERS)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
 
 class TheatreHallViewSet(
+    ReplicaReadMixin,
+    SparseFieldsMixin,
+    CachedListMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     GenericViewSet,
@@ -65,8 +127,17 @@ class TheatreHallViewSet(
     serializer_class = TheatreHallSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
 
+    @extend_schema(parameters=SPARSE_FIELDS_PARAMETERS)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
 
 class PlayViewSet(
+    ReplicaReadMixin,
+    SparseFieldsMixin,
+    RenderedListCacheMixin,
+    ConditionalListMixin,
+    ValuesListMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
@@ -74,18 +145,35 @@ class PlayViewSet(
 ):
     queryset = Play.objects.prefetch_related("genres", "actors")
     serializer_class = PlaySerializer
+    values_serializer_class = PlayListValuesSerializer
+    pagination_class = PlayPagination
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    # ?search= lists this many best matches instead of cursor pages
+    search_results = 50
+    rendered_cache = LRUCache(
+        settings.PLAY_CATALOGUE_CACHE_SIZE,
+        settings.PLAY_CATALOGUE_CACHE_TIMEOUT,
+    )
+    rendered_cache_models = (Play, Genre, Actor)
+    id_list_params = ("genres", "actors")
+    text_params = ("title", "search", "match")
 
     @staticmethod
-    def _params_to_ints(qs) -> list:
+    def _params_to_ints(name: str, qs) -> list:
         """Converts a list of string IDs to a list of integers"""
-        return [int(str_id) for str_id in qs.split(",")]
+        try:
+            return [int(str_id) for str_id in qs.split(",")]
+        except ValueError:
+            raise ValidationError({name: "Use comma separated integer ids."})
 
     def get_queryset(self) -> QuerySet:
         """Retrieve the plays with filters"""
-        title = self.request.query_params.get("title")
-        genres = self.request.query_params.get("genres")
-        actors = self.request.query_params.get("actors")
+        params = self.normalized_params(self.request)
+        title = params.get("title")
+        genres = params.get("genres")
+        actors = params.get("actors")
+        match_all = params.get("match") == "all"
+        search = params.get("search")
 
         queryset = self.queryset
 
@@ -93,14 +181,34 @@ class PlayViewSet(
             queryset = queryset.filter(title__icontains=title)
 
         if genres:
-            genres_ids = self._params_to_ints(genres)
-            queryset = queryset.filter(genres__id__in=genres_ids)
+            genres_ids = self._params_to_ints("genres", genres)
+            queryset = filter_related(
+                queryset, "genres", genres_ids, match_all
+            )
 
         if actors:
-            actors_ids = self._params_to_ints(actors)
-            queryset = queryset.filter(actors__id__in=actors_ids)
+            actors_ids = self._params_to_ints("actors", actors)
+            queryset = filter_related(
+                queryset, "actors", actors_ids, match_all
+            )
 
-        return queryset.distinct()
+        if search:
+            queryset = search_plays(queryset, search)
+
+        return queryset
+
+    def paginate_queryset(self, queryset):
+        """Search results keep their ranking, only the best are listed"""
+        if self.normalized_params(self.request).get("search"):
+            return list(queryset[:self.search_results])
+
+        return super().paginate_queryset(queryset)
+
+    def get_paginated_response(self, data):
+        if self.normalized_params(self.request).get("search"):
+            return Response(data)
+
+        return super().get_paginated_response(data)
 
     def get_serializer_class(self):
         """ get serializer depends on request"""
@@ -149,52 +257,313 @@ class PlayViewSet(
                 type=OpenApiTypes.STR,
                 description="Filter by play title (ex. ?title=drama)",
             ),
+            OpenApiParameter(
+                "match",
+                type=OpenApiTypes.STR,
+                enum=["any", "all"],
+                description=(
+                    "Plays with any (default) or all of the listed genres "
+                    "and actors (ex. ?genres=2,5&match=all)"
+                ),
+            ),
+            OpenApiParameter(
+                "search",
+                type=OpenApiTypes.STR,
+                description=(
+                    "Search title, description, actors and genres, "
+                    "best matches first (ex. ?search=hamlet)"
+                ),
+            ),
+            *SPARSE_FIELDS_PARAMETERS,
         ]
     )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @extend_schema(parameters=SPARSE_FIELDS_PARAMETERS)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
-class PerformanceViewSet(viewsets.ModelViewSet):
-    queryset = (
-        Performance.objects.all()
-        .select_related("play", "theatre_hall")
-        .annotate(
-            ticketd_available=(
-                F("theatre_hall__rows") * F("theatre_hall__seats_in_row")
-                - Count("tickets")
-            )
-        )
-    )
+
+class PerformanceViewSet(
+    ReplicaReadMixin,
+    SparseFieldsMixin,
+    ConditionalListMixin,
+    ValuesListMixin,
+    viewsets.ModelViewSet,
+):
+    queryset = Performance.objects.select_related("play", "theatre_hall")
     serializer_class = PerformanceSerializer
+    values_serializer_class = PerformanceListValuesSerializer
+    pagination_class = PerformancePagination
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    allocation_attempts = 3
+
+    @staticmethod
+    def _params_to_datetime(
+        name: str, date_str: str, days: int = 0
+    ) -> datetime:
+        """Start of the given date, shifted by days, in the server timezone"""
+        try:
+            date = datetime.strptime(date_str, "%Y-%m-%d").date()
+        except ValueError:
+            raise ValidationError({name: "Use the YYYY-MM-DD date format."})
+        return timezone.make_aware(
+            datetime.combine(date + timedelta(days=days), time.min)
+        )
+
+    @staticmethod
+    def _params_to_int(name: str, id_str: str) -> int:
+        try:
+            return int(id_str)
+        except ValueError:
+            raise ValidationError({name: "A valid integer is required."})
+
+    @property
+    def reads_summary(self) -> bool:
+        """list() with ?summary=true reads the PerformanceSummary table"""
+        return self.action == "list" and (
+            self.request.query_params.get("summary") in ("1", "true")
+        )
 
     def get_queryset(self) -> QuerySet:
-        """Endpoint for uploading image to specific Performance"""
+        """
+        Retrieve the performances with filters.
+
+        Dates are turned into show_time ranges, so the filters can use
+        the (play, show_time) and (theatre_hall, show_time) indexes.
+        The summary has the same fields and indexes, so it is filtered
+        the same way without joining Play and TheatreHall.
+        """
         date = self.request.query_params.get("date")
+        # ?date=d is ?date_from=d&date_to=d
+        date_from_param, date_to_param = (
+            ("date", "date") if date else ("date_from", "date_to")
+        )
+        date_from = self.request.query_params.get(date_from_param)
+        date_to = self.request.query_params.get(date_to_param)
         play_id_str = self.request.query_params.get("play")
+        theatre_hall_id_str = self.request.query_params.get("theatre_hall")
+
+        if self.reads_summary:
+            queryset = PerformanceSummary.objects.all()
+        else:
+            queryset = super().get_queryset()
+
+        if date_from:
+            queryset = queryset.filter(
+                show_time__gte=self._params_to_datetime(
+                    date_from_param, date_from
+                )
+            )
 
-        queryset = self.queryset
-
-        if date:
-            date = datetime.strptime(date, "%Y-%m-%d").date()
-            queryset = queryset.filter(show_time__date=date)
+        if date_to:
+            queryset = queryset.filter(
+                show_time__lt=self._params_to_datetime(
+                    date_to_param, date_to, days=1
+                )
+            )
 
         if play_id_str:
-            queryset = queryset.filter(play__id=int(play_id_str))
+            queryset = queryset.filter(
+                play__id=self._params_to_int("play", play_id_str)
+            )
+
+        if theatre_hall_id_str:
+            queryset = queryset.filter(
+                theatre_hall__id=self._params_to_int(
+                    "theatre_hall", theatre_hall_id_str
+                )
+            )
 
         return queryset
 
+    def get_values_serializer_class(self):
+        """The summary already is a single table, read as usual"""
+        if self.reads_summary:
+            return None
+
+        return super().get_values_serializer_class()
+
     def get_serializer_class(self):
         """ get serializer depends on request"""
+        if self.reads_summary:
+            return PerformanceSummarySerializer
+
         if self.action == "list":
             return PerformanceListSerializer
 
         if self.action == "retrieve":
             return PerformanceDetailSerializer
 
+        if self.action == "hold":
+            return SeatHoldSerializer
+
         return PerformanceSerializer
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "encoding",
+                type=OpenApiTypes.STR,
+                enum=["base64", "binary"],
+                description=(
+                    "Return the bitset as base64 inside JSON (default) "
+                    "or as raw application/octet-stream bytes"
+                ),
+            ),
+        ],
+        responses=OpenApiTypes.OBJECT,
+    )
+    @action(methods=["GET"], detail=True, url_path="seat-map")
+    def seat_map(self, request, pk=None):
+        """Endpoint with taken seats of Performance packed into a bitset"""
+        performance = get_object_or_404(
+            Performance.objects.select_related("theatre_hall"), pk=pk
+        )
+        self.check_object_permissions(request, performance)
+
+        theatre_hall = performance.theatre_hall
+        seat_map = pack_seats(
+            theatre_hall.rows,
+            theatre_hall.seats_in_row,
+            Ticket.objects.filter(performance=performance).values_list(
+                "row", "seat"
+            ),
+        )
+
+        if request.query_params.get("encoding") == "binary":
+            response = HttpResponse(
+                seat_map, content_type="application/octet-stream"
+            )
+            response["X-Theatre-Hall-Rows"] = theatre_hall.rows
+            response["X-Theatre-Hall-Seats-In-Row"] = theatre_hall.seats_in_row
+            return response
+
+        return Response(
+            {
+                "id": performance.id,
+                "rows": theatre_hall.rows,
+                "seats_in_row": theatre_hall.seats_in_row,
+                "taken_place": base64.b64encode(seat_map).decode("ascii"),
+            }
+        )
+
+    @action(
+        methods=["POST", "DELETE"],
+        detail=True,
+        permission_classes=[IsAuthenticated],
+    )
+    def hold(self, request, pk=None):
+        """
+        Endpoint for holding seats of Performance for a few minutes
+        before booking them, DELETE releases all held seats
+        """
+        performance = get_object_or_404(
+            Performance.objects.select_related("theatre_hall"), pk=pk
+        )
+
+        if request.method == "DELETE":
+            release_holds(performance, request.user)
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        serializer = self.get_serializer(
+            data=request.data,
+            context={
+                **self.get_serializer_context(),
+                "performance": performance,
+            },
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "count",
+                type=OpenApiTypes.INT,
+                description="Number of adjacent seats (ex. ?count=4)",
+            ),
+            OpenApiParameter(
+                "reserve",
+                type=OpenApiTypes.BOOL,
+                description=(
+                    "Book the found seats right away (ex. ?reserve=true)"
+                ),
+            ),
+        ],
+        request=None,
+        responses=OpenApiTypes.OBJECT,
+    )
+    @action(
+        methods=["POST"], detail=True, permission_classes=[IsAuthenticated]
+    )
+    def allocate(self, request, pk=None):
+        """
+        Endpoint for finding the best free adjacent seats of Performance,
+        nearest to the centre of the hall, and optionally booking them
+        """
+        performance = get_object_or_404(
+            Performance.objects.select_related("theatre_hall"), pk=pk
+        )
+        serializer = SeatAllocationSerializer(
+            data=request.query_params, context={"performance": performance}
+        )
+        serializer.is_valid(raise_exception=True)
+        count = serializer.validated_data["count"]
+        theatre_hall = performance.theatre_hall
+
+        for attempt in range(self.allocation_attempts):
+            seats = best_block(
+                theatre_hall.rows,
+                theatre_hall.seats_in_row,
+                occupied_seats(performance, request.user),
+                count,
+            )
+
+            if not seats:
+                return Response(
+                    {"detail": f"There are no {count} adjacent free seats."},
+                    status=status.HTTP_409_CONFLICT,
+                )
+
+            if not serializer.validated_data["reserve"]:
+                return Response(
+                    {
+                        "seats": [
+                            {"row": row, "seat": seat} for row, seat in seats
+                        ]
+                    }
+                )
+
+            tickets_data = [
+                {"performance": performance, "row": row, "seat": seat}
+                for row, seat in seats
+            ]
+            try:
+                # the same checks as ReservationSerializer, the user's
+                # own holds don't count
+                validate_seats_available(tickets_data, request.user)
+                reservation = create_reservation(
+                    tickets_data, user=request.user
+                )
+            except (ValidationError, SeatsUnavailable):
+                # seats were sold or held in the meantime, look for
+                # another block
+                continue
+
+            return Response(
+                ReservationSerializer(reservation).data,
+                status=status.HTTP_201_CREATED,
+            )
+
+        return Response(
+            {"detail": "Seats were sold out meanwhile, please try again."},
+            status=status.HTTP_409_CONFLICT,
+        )
+
     @extend_schema(
         parameters=[
             OpenApiParameter(
@@ -210,24 +579,66 @@ class PerformanceViewSet(viewsets.ModelViewSet):
                     "(ex. ?date=YYYY-mm-dd)"
                 ),
             ),
+            OpenApiParameter(
+                "date_from",
+                type=OpenApiTypes.DATE,
+                description=(
+                    "Performances from this day on "
+                    "(ex. ?date_from=YYYY-mm-dd)"
+                ),
+            ),
+            OpenApiParameter(
+                "date_to",
+                type=OpenApiTypes.DATE,
+                description=(
+                    "Performances up to this day, inclusive "
+                    "(ex. ?date_to=YYYY-mm-dd)"
+                ),
+            ),
+            OpenApiParameter(
+                "theatre_hall",
+                type=OpenApiTypes.INT,
+                description="Filter by TheatreHall id (ex. ?theatre_hall=2)",
+            ),
+            OpenApiParameter(
+                "summary",
+                type=OpenApiTypes.BOOL,
+                description=(
+                    "Read the denormalized schedule summary, a single "
+                    "table without joins (ex. ?summary=true)"
+                ),
+            ),
+            *SPARSE_FIELDS_PARAMETERS,
         ]
     )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
-
-class ReservationPagination(PageNumberPagination):
-    page_size = 5
-    max_page_size = 100
+    @extend_schema(parameters=SPARSE_FIELDS_PARAMETERS)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
 
 class ReservationViewSet(
+    ReplicaReadMixin,
+    SparseFieldsMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     GenericViewSet,
 ):
     queryset = Reservation.objects.prefetch_related(
-        "tickets__performance__play", "tickets__performance__theatre_hall"
+        Prefetch(
+            "tickets",
+            queryset=Ticket.objects.select_related(
+                "performance__play", "performance__theatre_hall"
+            ),
+        ),
+        Prefetch(
+            "archived_tickets",
+            queryset=ArchivedTicket.objects.select_related(
+                "performance__play", "performance__theatre_hall"
+            ),
+        ),
     )
     serializer_class = ReservationSerializer
     pagination_class = ReservationPagination
@@ -235,7 +646,7 @@ class ReservationViewSet(
 
     def get_queryset(self) -> QuerySet:
         """Retrieve the Reservation with filter by user"""
-        return Reservation.objects.filter(user=self.request.user)
+        return super().get_queryset().filter(user=self.request.user)
 
     def get_serializer_class(self):
         """ get serializer depends on request"""
@@ -247,3 +658,54 @@ class ReservationViewSet(
     def perform_create(self, serializer):
         """ Match user to response"""
         serializer.save(user=self.request.user)
+
+    @extend_schema(parameters=SPARSE_FIELDS_PARAMETERS)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @extend_schema(
+        responses={
+            status.HTTP_201_CREATED: ReservationSerializer,
+            status.HTTP_202_ACCEPTED: ReservationRequestSerializer,
+        }
+    )
+    def create(self, request, *args, **kwargs):
+        """
+        With RESERVATION_ASYNC the reservation is only validated and
+        queued, its outcome is available at reservation/requests/{id}/
+        """
+        if not settings.RESERVATION_ASYNC:
+            return super().create(request, *args, **kwargs)
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        reservation_request = serializer.enqueue(user=request.user)
+
+        return Response(
+            ReservationRequestSerializer(reservation_request).data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={
+                "Location": reverse(
+                    "performance:reservation-request",
+                    args=[reservation_request.id],
+                )
+            },
+        )
+
+    @extend_schema(responses=ReservationRequestSerializer)
+    @action(
+        methods=["GET"],
+        detail=False,
+        url_path=(
+            r"requests/(?P<request_id>"
+            r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})"
+        ),
+        url_name="request",
+    )
+    def request_status(self, request, request_id=None):
+        """Endpoint with the outcome of a queued reservation"""
+        reservation_request = get_object_or_404(
+            ReservationRequest, id=request_id, user=request.user
+        )
+
+        return Response(ReservationRequestSerializer(reservation_request).data)
@@ -0,0 +1,41 @@
+import copy
+
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from config.lru_cache import LRUCache
+
+
+users = LRUCache(
+    settings.AUTH_USER_CACHE_SIZE, settings.AUTH_USER_CACHE_TIMEOUT
+)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication which keeps resolved users in a short lived
+    per-process cache instead of querying the user on every request.
+
+    Saving or deleting a user drops it from the cache of the process
+    (see user.signals), other processes pick the change up within
+    AUTH_USER_CACHE_TIMEOUT seconds.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                "Token contained no recognizable user identification"
+            )
+
+        user = users.get(user_id)
+        if user is None:
+            user = super().get_user(validated_token)
+            users.set(user_id, user)
+
+        # requests must not share (and modify) the cached instance, nor
+        # its related object and prefetch caches
+        return copy.deepcopy(user)
@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from user.authentication import CachedJWTAuthentication, users
+
+
+MANAGE_USER_URL = reverse("user:manage")
+
+
+class CachedJWTAuthenticationTest(TestCase):
+    def setUp(self) -> None:
+        users.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "hans@zimmer.com",
+            "inception",
+        )
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+
+    def test_user_resolved_from_cache(self):
+        self.client.get(MANAGE_USER_URL)
+
+        with CaptureQueriesContext(connection) as queries:
+            result = self.client.get(MANAGE_USER_URL)
+
+        self.assertEqual(result.status_code, status.HTTP_200_OK)
+        self.assertEqual(result.data["email"], "hans@zimmer.com")
+        self.assertEqual(len(queries), 0)
+
+    def test_cache_invalidated_on_update(self):
+        self.client.get(MANAGE_USER_URL)
+
+        self.client.patch(MANAGE_USER_URL, {"email": "hans@gladiator.com"})
+        result = self.client.get(MANAGE_USER_URL)
+
+        self.assertEqual(result.data["email"], "hans@gladiator.com")
+
+    def test_deactivated_user_rejected(self):
+        self.client.get(MANAGE_USER_URL)
+
+        self.user.is_active = False
+        self.user.save()
+        result = self.client.get(MANAGE_USER_URL)
+
+        self.assertEqual(result.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_requests_get_separate_caches(self):
+        authentication = CachedJWTAuthentication()
+        token = AccessToken.for_user(self.user)
+        authentication.get_user(token)
+        cached = users.get(token[api_settings.USER_ID_CLAIM])
+        cached._prefetched_objects_cache = {"groups": []}
+
+        first = authentication.get_user(token)
+        first._prefetched_objects_cache["groups"].append("first request")
+        second = authentication.get_user(token)
+
+        self.assertEqual(second._prefetched_objects_cache, {"groups": []})
+        self.assertEqual(cached._prefetched_objects_cache, {"groups": []})